@@ -1,10 +1,11 @@
 """API路由主入口"""
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 # 避免循环导入
 from api.endpoints import prompt, pii, islamic, hikma, promptguard
 
 # 创建主路由实例
-api_router = APIRouter()
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 # 注册路由
 api_router.include_router(
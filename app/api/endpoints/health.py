@@ -3,11 +3,17 @@ from fastapi import APIRouter, Depends
 from datetime import datetime
 import os
 import platform
+import time
 from core.dependencies import get_services, Services
 from core.config import settings
 
 router = APIRouter()
 
+# 进程生命周期内不变的系统信息，导入时采集一次
+_PLATFORM = platform.platform()
+_PYTHON_VERSION = platform.python_version()
+_START_TS = time.time()
+
 @router.get("/")
 async def health_check(services: Services = Depends(get_services)):
     """健康检查端点"""
@@ -15,16 +21,17 @@ async def health_check(services: Services = Depends(get_services)):
     pii_detector = services.pii_detector
 
     loaded_models_list = list(model_manager.models.keys())
-    pii_rules_count = len(pii_detector.rules)
-    pii_rules_enabled = sum(1 for rule in pii_detector.rules if isinstance(rule, dict) and rule.get("enabled", True))
+    pii_rules_count = pii_detector.rules_count
+    pii_rules_enabled = pii_detector.enabled_rules_count
 
     return {
         "status": "healthy",
         "version": settings.VERSION,
         "timestamp": datetime.now().isoformat(),
+        "uptime_seconds": round(time.time() - _START_TS, 1),
         "system_info": {
-            "platform": platform.platform(),
-            "python_version": platform.python_version(),
+            "platform": _PLATFORM,
+            "python_version": _PYTHON_VERSION,
         },
         "components": {
             "model_manager": {
@@ -1,8 +1,15 @@
 """伊斯兰内容相关API端点"""
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, List, TYPE_CHECKING
 from core.logging import get_logger
 from core.dependencies import get_services,Services
+from models.islamic import (
+    IslamicDetectionRequest,
+    IslamicChatRequest,
+    IslamicBatchDetectionRequest,
+    IslamicBatchChatRequest
+)
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -14,9 +21,9 @@ async def get_islamic_rules(
 ) -> Dict[str, Any]:
     """获取 Islamic 规则配置"""
     try:
-        logger.info(f"Getting Islamic rules for language: {language}")
+        logger.info("Getting Islamic rules for language: %s", language)
         rules = services.islamic_context_manager.get_rules(language)
-        logger.debug(f"Retrieved rules: {rules}")
+        logger.debug("Retrieved rules: %s", rules)
         
         if not rules:
             logger.warning("No rules found")
@@ -46,11 +53,11 @@ async def get_all_islamic_rules(
         )
 
 @router.put("/rules/bulk")
-def update_rules_bulk(rules_data: dict, services: Services = Depends(get_services)):
+async def update_rules_bulk(rules_data: dict, services: Services = Depends(get_services)):
     """批量更新Islamic规则"""
     try:
         manager = services.islamic_context_manager
-        success = manager.update_rules(rules_data.get("rules", []))
+        success = await manager.update_rules(rules_data.get("rules", []))
         if success:
             return {
                 "status": "success",
@@ -69,19 +76,19 @@ def update_rules_bulk(rules_data: dict, services: Services = Depends(get_service
 
 @router.post("/detect")
 async def detect_islamic_context(
-    request: Dict[str, Any],
+    request: IslamicDetectionRequest,
     services: Services = Depends(get_services)
 ) -> Dict[str, Any]:
     """检测文本中的 Islamic 上下文"""
     try:
-        text = request.get("text", "")
+        text = request.text
         if not text:
             raise HTTPException(
                 status_code=400,
                 detail="Text field is required"
             )
             
-        result = await services.islamic_context_manager.detect(text)
+        result = await services.islamic_context_manager.detect(text, mode=request.mode)
         return result
         
     except Exception as e:
@@ -91,15 +98,34 @@ async def detect_islamic_context(
             detail=f"Failed to detect Islamic context: {str(e)}"
         )
 
+@router.post("/detect/batch")
+async def batch_detect_islamic_context(
+    request: IslamicBatchDetectionRequest,
+    services: Services = Depends(get_services)
+) -> Dict[str, Any]:
+    """并发检测多段文本中的 Islamic 上下文"""
+    try:
+        results = await services.islamic_context_manager.detect_many(
+            request.texts, mode=request.mode
+        )
+        return {"results": results, "total": len(results)}
+        
+    except Exception as e:
+        logger.error(f"Error in batch Islamic context detection: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to detect Islamic context: {str(e)}"
+        )
+
 @router.post("/chat")
 async def chat_with_deepseek(
-    request: Dict[str, Any],
+    request: IslamicChatRequest,
     services: Services = Depends(get_services)
 ) -> Dict[str, Any]:
     """直接调用 DeepSeek API 获取回答"""
     try:
-        text = request.get("text", "")
-        use_islamic_context = request.get("use_islamic_context", False)
+        text = request.text
+        use_islamic_context = request.use_islamic_context
         
         if not text:
             raise HTTPException(
@@ -118,4 +144,64 @@ async def chat_with_deepseek(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get response: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/chat/stream", response_model=None)
+async def chat_with_deepseek_stream(
+    request: IslamicChatRequest,
+    services: Services = Depends(get_services)
+) -> StreamingResponse:
+    """流式调用 DeepSeek API，回答内容生成后立即发送给客户端"""
+    if not request.text:
+        raise HTTPException(
+            status_code=400,
+            detail="Text field is required"
+        )
+    
+    stream = services.islamic_context_manager.chat_stream(
+        text=request.text,
+        use_islamic_context=request.use_islamic_context
+    )
+    try:
+        # 先取第一段内容，让配置/连接错误在响应开始前以 500 返回
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = ""
+    except Exception as e:
+        logger.error(f"Error in DeepSeek chat stream: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get response: {str(e)}"
+        )
+    
+    async def _body():
+        yield first_chunk
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as e:
+            # 响应头已发出，无法再改状态码：重新抛出让服务器中断分块传输，客户端得到不完整响应而不是被截断的 200
+            logger.error("DeepSeek chat stream interrupted: %s", e)
+            raise
+    
+    return StreamingResponse(_body(), media_type="text/plain; charset=utf-8")
+
+@router.post("/chat/batch")
+async def batch_chat_with_deepseek(
+    request: IslamicBatchChatRequest,
+    services: Services = Depends(get_services)
+) -> Dict[str, Any]:
+    """并发调用 DeepSeek API 获取多段文本的回答"""
+    try:
+        results = await services.islamic_context_manager.chat_many(
+            request.texts,
+            use_islamic_context=request.use_islamic_context
+        )
+        return {"results": results, "total": len(results)}
+        
+    except Exception as e:
+        logger.error(f"Error in batch DeepSeek chat: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get responses: {str(e)}"
+        )
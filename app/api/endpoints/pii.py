@@ -1,12 +1,14 @@
 """PII检测相关API端点"""
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
+import asyncio
+import hashlib
 import uuid
 from fastapi import APIRouter, Path, Query, HTTPException, Depends, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-import json
 import logging
+import orjson
 
 from models.pii import (
     PIIRule,
@@ -27,19 +29,27 @@ from core.config import settings
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 风险等级判定用的实体类型集合
+_HIGH_RISK_TYPES = frozenset({"CREDIT_CARD", "PASSPORT", "ID_NUMBER", "BANK_ACCOUNT"})
+_MEDIUM_RISK_TYPES = frozenset({"EMAIL", "PHONE", "ADDRESS"})
+
+# 热点接口默认跳过返回值的 response_model 校验，VALIDATE_API_RESPONSE=true 时恢复
+_HOT_RESPONSE_MODEL = Dict[str, Any] if settings.VALIDATE_API_RESPONSE else None
+
 class DetectionRequest(BaseModel):
     text: str
     mask: bool = False
     batch: bool = False
 
-@router.get("/rules")
+@router.get("/rules", response_model=None)
 async def get_rules(
     services: Services = Depends(get_services)
 ) -> Dict[str, List[Dict[str, Any]]]:
     """获取所有PII规则"""
     try:
-        rules = services.pii_detector.rules  # 直接访问 rules 属性
-        logger.info(f"API returning {len(rules)} PII rules")
+        # 规则在加载/更新时已经过 PIIRule 校验，直接返回，不再做响应校验
+        rules = services.pii_detector.rules
+        logger.info("API returning %d PII rules", len(rules))
         return {"rules": rules}
     except Exception as e:
         logger.error(f"Error getting PII rules: {str(e)}")
@@ -65,21 +75,20 @@ async def get_pii_rule(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get rule: {str(e)}")
 
-@router.post("/rules")
+@router.post("/rules", response_model=None)
 async def create_rule(rule: PIIRule, services: Services = Depends(get_services)):
     """创建新的PII规则"""
     try:
         pii_detector = services.pii_detector
-        rule_data = rule.dict()
-        rule_data.setdefault('country', '')
-        rule_data.setdefault('enabled', True)
+        # PIIRule 已声明 country/enabled 等默认值，无需再补齐
+        rule_data = rule.model_dump()
         pii_detector.rules.append(rule_data)
-        pii_detector._register_custom_rules()
+        pii_detector.mark_rules_changed()
         return rule_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.put("/rules/{rule_id}")
+@router.put("/rules/{rule_id}", response_model=None)
 async def update_rule(rule_id: str, rule: PIIRule, services: Services = Depends(get_services)) -> Dict[str, Any]:
     """更新单个PII规则"""
     try:
@@ -87,8 +96,8 @@ async def update_rule(rule_id: str, rule: PIIRule, services: Services = Depends(
 
         for i, existing_rule in enumerate(pii_detector.rules):
             if existing_rule.get("id") == rule_id:
-                pii_detector.rules[i] = rule.dict()
-                pii_detector._register_custom_rules()
+                pii_detector.rules[i] = rule.model_dump()
+                pii_detector.mark_rules_changed()
                 return pii_detector.rules[i]
 
         raise HTTPException(
@@ -111,7 +120,7 @@ async def delete_rule(rule_id: str, services: Services = Depends(get_services)):
     try:
         pii_detector = services.pii_detector
         pii_detector.rules = [r for r in pii_detector.rules if r.get("id") != rule_id]
-        pii_detector._register_custom_rules()
+        pii_detector.mark_rules_changed()
         return {"message": "Rule deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -130,22 +139,23 @@ def reload_rules(services: Services = Depends(get_services)) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/detect")
+@router.post("/detect", response_model=_HOT_RESPONSE_MODEL)
 async def detect_pii(
-    request: Dict[str, Any],
+    request: PIIDetectionRequest,
     services: Services = Depends(get_services)
 ) -> Dict[str, Any]:
     """检测文本中的PII信息"""
     try:
-        text = request.get("text", "")
+        text = request.text
         if not text:
             raise HTTPException(
                 status_code=400,
                 detail="Text field is required"
             )
             
-        # 使用已初始化的 pii_detector 实例
-        result = services.pii_detector.detect_pii(text)
+        # 使用已初始化的 pii_detector 实例，在线程池中执行以免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, services.pii_detector.detect_pii, text)
         return result
         
     except Exception as e:
@@ -155,21 +165,22 @@ async def detect_pii(
             detail=f"Failed to detect PII: {str(e)}"
         )
 
-@router.put("/rules/bulk", response_model=PIIRuleResponse)
+@router.put("/rules/bulk", response_model=None)
 async def update_rules_bulk(rules_data: PIIRuleBulkUpdate, services: Services = Depends(get_services)) -> Dict[str, Any]:
     """批量更新PII规则"""
     try:
         pii_detector = services.pii_detector
         logger.info(f"Updating {len(rules_data.rules)} PII rules")
         
-        # Pydantic 已经验证了数据格式，直接使用
-        success = pii_detector.update_rules([rule.dict() for rule in rules_data.rules])
+        # Pydantic 已经验证了数据格式，只序列化一次并复用于检测器和响应
+        rules = [rule.model_dump() for rule in rules_data.rules]
+        success = pii_detector.update_rules(rules)
         
         if success:
             return {
                 "status": "success",
-                "message": f"Successfully updated {len(rules_data.rules)} rules",
-                "rules": rules_data.rules
+                "message": f"Successfully updated {len(rules)} rules",
+                "rules": rules
             }
         else:
             raise HTTPException(
@@ -184,12 +195,11 @@ async def update_rules_bulk(rules_data: PIIRuleBulkUpdate, services: Services =
             detail=f"Failed to update rules: {str(e)}"
         )
 
-@router.post("/mask")
-async def mask_pii(request: Request, services: Services = Depends(get_services)) -> Dict[str, Any]:
+@router.post("/mask", response_model=_HOT_RESPONSE_MODEL)
+async def mask_pii(request: PIIDetectionRequest, services: Services = Depends(get_services)) -> Dict[str, Any]:
     """PII脱敏处理"""
     try:
-        data = await request.json()
-        text = data.get("text", "")
+        text = request.text
 
         if not text:
             raise HTTPException(
@@ -197,7 +207,8 @@ async def mask_pii(request: Request, services: Services = Depends(get_services))
                 detail="Text field is required"
             )
 
-        result = services.pii_detector.detect_pii(text)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, services.pii_detector.detect_pii, text)
         return {"masked_text": result.get("masked_text", text)}
 
     except Exception as e:
@@ -209,21 +220,15 @@ async def mask_pii(request: Request, services: Services = Depends(get_services))
 
 def calculate_risk_level(entities: List[Dict[str, Any]]) -> str:
     """计算整体风险等级"""
-    if not entities:
-        return "low"
-        
-    # 根据实体数量和类型计算风险等级
-    high_risk_types = {"CREDIT_CARD", "PASSPORT", "ID_NUMBER", "BANK_ACCOUNT"}
-    medium_risk_types = {"EMAIL", "PHONE", "ADDRESS"}
-    
-    high_risk_count = sum(1 for e in entities if e["type"] in high_risk_types)
-    medium_risk_count = sum(1 for e in entities if e["type"] in medium_risk_types)
-    
-    if high_risk_count > 0:
-        return "high"
-    elif medium_risk_count > 0:
-        return "medium"
-    return "low"
+    # 单次遍历：命中高风险类型即返回，否则记录是否出现中风险类型
+    has_medium = False
+    for e in entities:
+        entity_type = e["type"]
+        if entity_type in _HIGH_RISK_TYPES:
+            return "high"
+        if entity_type in _MEDIUM_RISK_TYPES:
+            has_medium = True
+    return "medium" if has_medium else "low"
 
 @router.post("/detect/batch")
 async def batch_detect_pii(
@@ -232,20 +237,19 @@ async def batch_detect_pii(
 ):
     """批量检测文本中的PII"""
     try:
-        results = []
-        for text in request.texts:
-            result = services.pii_detector.detect_pii(
-                text=text,
-                language=request.language
-            )
-            results.append(result)
+        # 整批文本一次性交给检测器（共享 spaCy nlp.pipe），并放到线程池中执行以免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, services.pii_detector.detect_pii_batch, request.texts
+        )
         
+        safe_count = sum(1 for r in results if r["is_safe"])
         return {
             "results": results,
             "summary": {
                 "total": len(results),
-                "safe_count": sum(1 for r in results if r["is_safe"]),
-                "unsafe_count": sum(1 for r in results if not r["is_safe"])
+                "safe_count": safe_count,
+                "unsafe_count": len(results) - safe_count
             }
         }
     except Exception as e:
@@ -262,258 +266,282 @@ async def preview_config(
 ):
     """预览PII检测配置效果"""
     try:
-        result = services.pii_detector.detect_pii(request.text)
-        return result
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, services.pii_detector.detect_pii, request.text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/technical-info")
-async def get_technical_info():
-    """获取PII检测系统技术信息"""
-    return {
-        "system_overview": {
-            "name": "Custom PII Detection & Filtering System",
-            "version": "1.0",
-            "description": "基于 Presidio 框架的东南亚地区 PII 检测和过滤系统，集成了自定义规则引擎"
+def _encode_static_json(payload: Dict[str, Any]) -> Tuple[bytes, str]:
+    """预先序列化静态响应并计算 ETag"""
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return body, etag
+
+def _static_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """返回预编码的 JSON 响应，命中 If-None-Match 时返回 304"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+# PII检测系统技术信息（静态内容，导入时预编码一次）
+_TECHNICAL_INFO = {
+    "system_overview": {
+        "name": "Custom PII Detection & Filtering System",
+        "version": "1.0",
+        "description": "基于 Presidio 框架的东南亚地区 PII 检测和过滤系统，集成了自定义规则引擎"
+    },
+    "core_technologies": {
+        "presidio_framework": {
+            "name": "Microsoft Presidio",
+            "version": "2.2.32",
+            "components": [
+                {
+                    "name": "Presidio Analyzer",
+                    "description": "核心分析引擎，用于PII实体识别",
+                    "features": [
+                        "预训练模型支持",
+                        "自定义识别器集成",
+                        "上下文感知分析"
+                    ]
+                },
+                {
+                    "name": "Presidio Anonymizer",
+                    "description": "PII脱敏处理引擎",
+                    "features": [
+                        "多种脱敏策略",
+                        "可定制替换规则",
+                        "保持文本结构"
+                    ]
+                }
+            ]
         },
-        "core_technologies": {
-            "presidio_framework": {
-                "name": "Microsoft Presidio",
-                "version": "2.2.32",
-                "components": [
+        "nlp_engine": {
+            "name": "Spacy NLP",
+            "models": [
+                {
+                    "name": "en_core_web_lg",
+                    "description": "英语大型模型",
+                    "capabilities": [
+                        "命名实体识别",
+                        "词性标注",
+                        "依存句法分析"
+                    ]
+                },
+                {
+                    "name": "xx_ent_wiki_sm",
+                    "description": "多语言实体识别模型",
+                    "supported_languages": [
+                        "马来语 (ms)",
+                        "印尼语 (id)",
+                        "中文 (zh)"
+                    ]
+                }
+            ]
+        }
+    },
+    "custom_pii_rules": {
+        "rule_categories": [
+            {
+                "category": "ID_NUMBERS",
+                "rules": [
                     {
-                        "name": "Presidio Analyzer",
-                        "description": "核心分析引擎，用于PII实体识别",
-                        "features": [
-                            "预训练模型支持",
-                            "自定义识别器集成",
-                            "上下文感知分析"
-                        ]
+                        "name": "Brunei IC",
+                        "description": "文莱身份证号码识别",
+                        "pattern": "\\b\\d{2}-\\d{6}\\b",
+                        "examples": ["00-123456"]
                     },
                     {
-                        "name": "Presidio Anonymizer",
-                        "description": "PII脱敏处理引擎",
-                        "features": [
-                            "多种脱敏策略",
-                            "可定制替换规则",
-                            "保持文本结构"
-                        ]
+                        "name": "Singapore NRIC",
+                        "description": "新加坡身份证号码识别",
+                        "pattern": "\\b[STFG]\\d{7}[A-Z]\\b",
+                        "examples": ["S1234567A"]
+                    },
+                    {
+                        "name": "Malaysian NRIC",
+                        "description": "马来西亚身份证号码识别",
+                        "pattern": "\\b\\d{6}-\\d{2}-\\d{4}\\b",
+                        "examples": ["123456-12-1234"]
                     }
                 ]
             },
-            "nlp_engine": {
-                "name": "Spacy NLP",
-                "models": [
+            {
+                "category": "NAMES",
+                "rules": [
                     {
-                        "name": "en_core_web_lg",
-                        "description": "英语大型模型",
-                        "capabilities": [
-                            "命名实体识别",
-                            "词性标注",
-                            "依存句法分析"
+                        "name": "Brunei Royal Names",
+                        "description": "文莱皇室名称识别",
+                        "patterns": [
+                            "\\b(Pengiran|Yang Teramat Mulia|Yang Di-Pertuan)\\b",
+                            "\\b(Paduka Seri|Duli Yang Teramat)\\b"
                         ]
                     },
                     {
-                        "name": "xx_ent_wiki_sm",
-                        "description": "多语言实体识别模型",
-                        "supported_languages": [
-                            "马来语 (ms)",
-                            "印尼语 (id)",
-                            "中文 (zh)"
+                        "name": "Malay Names",
+                        "description": "马来名称识别",
+                        "patterns": [
+                            "\\b(bin|binti)\\b",
+                            "\\b(Haji|Hajjah)\\b"
                         ]
                     }
                 ]
             }
-        },
-        "custom_pii_rules": {
-            "rule_categories": [
+        ],
+        "rule_features": [
+            "支持正则表达式模式",
+            "支持上下文验证",
+            "支持多语言检测",
+            "支持自定义置信度阈值",
+            "支持规则优先级设置"
+        ]
+    },
+    "supported_regions": {
+        "brunei": {
+            "name": "文莱",
+            "supported_pii_types": [
                 {
-                    "category": "ID_NUMBERS",
-                    "rules": [
-                        {
-                            "name": "Brunei IC",
-                            "description": "文莱身份证号码识别",
-                            "pattern": "\\b\\d{2}-\\d{6}\\b",
-                            "examples": ["00-123456"]
-                        },
-                        {
-                            "name": "Singapore NRIC",
-                            "description": "新加坡身份证号码识别",
-                            "pattern": "\\b[STFG]\\d{7}[A-Z]\\b",
-                            "examples": ["S1234567A"]
-                        },
-                        {
-                            "name": "Malaysian NRIC",
-                            "description": "马来西亚身份证号码识别",
-                            "pattern": "\\b\\d{6}-\\d{2}-\\d{4}\\b",
-                            "examples": ["123456-12-1234"]
-                        }
-                    ]
+                    "name": "Brunei IC",
+                    "description": "文莱身份证号码",
+                    "pattern": "\\b\\d{2}-\\d{6}\\b"
                 },
                 {
-                    "category": "NAMES",
-                    "rules": [
-                        {
-                            "name": "Brunei Royal Names",
-                            "description": "文莱皇室名称识别",
-                            "patterns": [
-                                "\\b(Pengiran|Yang Teramat Mulia|Yang Di-Pertuan)\\b",
-                                "\\b(Paduka Seri|Duli Yang Teramat)\\b"
-                            ]
-                        },
-                        {
-                            "name": "Malay Names",
-                            "description": "马来名称识别",
-                            "patterns": [
-                                "\\b(bin|binti)\\b",
-                                "\\b(Haji|Hajjah)\\b"
-                            ]
-                        }
-                    ]
+                    "name": "Brunei Names",
+                    "description": "文莱人名识别",
+                    "includes": ["通用名称", "皇室名称"]
                 }
-            ],
-            "rule_features": [
-                "支持正则表达式模式",
-                "支持上下文验证",
-                "支持多语言检测",
-                "支持自定义置信度阈值",
-                "支持规则优先级设置"
             ]
         },
-        "supported_regions": {
-            "brunei": {
-                "name": "文莱",
-                "supported_pii_types": [
-                    {
-                        "name": "Brunei IC",
-                        "description": "文莱身份证号码",
-                        "pattern": "\\b\\d{2}-\\d{6}\\b"
-                    },
-                    {
-                        "name": "Brunei Names",
-                        "description": "文莱人名识别",
-                        "includes": ["通用名称", "皇室名称"]
-                    }
-                ]
-            },
-            "singapore": {
-                "name": "新加坡",
-                "supported_pii_types": [
-                    {
-                        "name": "Singapore NRIC",
-                        "description": "新加坡身份证号码",
-                        "pattern": "\\b[STFG]\\d{7}[A-Z]\\b"
-                    }
-                ]
-            },
-            "malaysia": {
-                "name": "马来西亚",
-                "supported_pii_types": [
-                    {
-                        "name": "Malaysian NRIC",
-                        "description": "马来西亚身份证号码",
-                        "pattern": "\\b\\d{6}-\\d{2}-\\d{4}\\b"
-                    }
-                ]
-            }
+        "singapore": {
+            "name": "新加坡",
+            "supported_pii_types": [
+                {
+                    "name": "Singapore NRIC",
+                    "description": "新加坡身份证号码",
+                    "pattern": "\\b[STFG]\\d{7}[A-Z]\\b"
+                }
+            ]
         },
-        "performance_metrics": {
-            "average_processing_speed": "~1000 tokens/second",
-            "supported_languages": ["en", "ms", "id", "zh"],
-            "concurrent_requests": "支持",
-            "rule_update_time": "<1s",
-            "accuracy_metrics": {
-                "precision": "95%+",
-                "recall": "90%+",
-                "f1_score": "92%+"
+        "malaysia": {
+            "name": "马来西亚",
+            "supported_pii_types": [
+                {
+                    "name": "Malaysian NRIC",
+                    "description": "马来西亚身份证号码",
+                    "pattern": "\\b\\d{6}-\\d{2}-\\d{4}\\b"
+                }
+            ]
+        }
+    },
+    "performance_metrics": {
+        "average_processing_speed": "~1000 tokens/second",
+        "supported_languages": ["en", "ms", "id", "zh"],
+        "concurrent_requests": "支持",
+        "rule_update_time": "<1s",
+        "accuracy_metrics": {
+            "precision": "95%+",
+            "recall": "90%+",
+            "f1_score": "92%+"
+        }
+    },
+    "integration_features": {
+        "api_interface": "RESTful API",
+        "bulk_processing": "支持",
+        "real_time_detection": "支持",
+        "configuration_preview": "支持",
+        "custom_rule_management": {
+            "rule_import": "支持JSON批量导入",
+            "rule_export": "支持JSON格式导出",
+            "rule_validation": "自动语法检查",
+            "rule_testing": "支持样本测试"
+        }
+    }
+}
+_TECHNICAL_INFO_BODY, _TECHNICAL_INFO_ETAG = _encode_static_json(_TECHNICAL_INFO)
+
+@router.get("/technical-info")
+async def get_technical_info(request: Request) -> Response:
+    """获取PII检测系统技术信息"""
+    return _static_json_response(request, _TECHNICAL_INFO_BODY, _TECHNICAL_INFO_ETAG)
+
+# 支持的NLP模型信息（静态内容，导入时预编码一次）
+_MODELS_INFO = {
+    "models": [
+        {
+            "id": "en_core_web_lg",
+            "name": "English Large Model",
+            "language": "en",
+            "size": "789MB",
+            "description": "英语大型模型，支持完整的NLP功能",
+            "features": [
+                "命名实体识别",
+                "词性标注",
+                "依存句法分析",
+                "词向量"
+            ],
+            "performance": {
+                "accuracy": "92%",
+                "speed": "~1000 tokens/s"
             }
         },
-        "integration_features": {
-            "api_interface": "RESTful API",
-            "bulk_processing": "支持",
-            "real_time_detection": "支持",
-            "configuration_preview": "支持",
-            "custom_rule_management": {
-                "rule_import": "支持JSON批量导入",
-                "rule_export": "支持JSON格式导出",
-                "rule_validation": "自动语法检查",
-                "rule_testing": "支持样本测试"
+        {
+            "id": "xx_ent_wiki_sm",
+            "name": "Multilingual Small Model",
+            "languages": ["ms", "id", "zh"],
+            "size": "45MB",
+            "description": "多语言小型模型，专注于实体识别",
+            "features": [
+                "命名实体识别",
+                "基础词性标注"
+            ],
+            "performance": {
+                "accuracy": "85%",
+                "speed": "~2000 tokens/s"
             }
         }
+    ],
+    "current_model": "en_core_web_lg",
+    "model_settings": {
+        "auto_language_detection": True,
+        "fallback_model": "xx_ent_wiki_sm",
+        "cache_enabled": True,
+        "cache_size": "1GB"
     }
+}
+_MODELS_INFO_BODY, _MODELS_INFO_ETAG = _encode_static_json(_MODELS_INFO)
 
 @router.get("/models")
-async def get_models():
+async def get_models(request: Request) -> Response:
     """获取支持的NLP模型信息"""
-    return {
-        "models": [
-            {
-                "id": "en_core_web_lg",
-                "name": "English Large Model",
-                "language": "en",
-                "size": "789MB",
-                "description": "英语大型模型，支持完整的NLP功能",
-                "features": [
-                    "命名实体识别",
-                    "词性标注",
-                    "依存句法分析",
-                    "词向量"
-                ],
-                "performance": {
-                    "accuracy": "92%",
-                    "speed": "~1000 tokens/s"
-                }
-            },
-            {
-                "id": "xx_ent_wiki_sm",
-                "name": "Multilingual Small Model",
-                "languages": ["ms", "id", "zh"],
-                "size": "45MB",
-                "description": "多语言小型模型，专注于实体识别",
-                "features": [
-                    "命名实体识别",
-                    "基础词性标注"
-                ],
-                "performance": {
-                    "accuracy": "85%",
-                    "speed": "~2000 tokens/s"
-                }
-            }
-        ],
-        "current_model": "en_core_web_lg",
-        "model_settings": {
-            "auto_language_detection": True,
-            "fallback_model": "xx_ent_wiki_sm",
-            "cache_enabled": True,
-            "cache_size": "1GB"
+    return _static_json_response(request, _MODELS_INFO_BODY, _MODELS_INFO_ETAG)
+
+# 当前使用的模型信息（静态内容，导入时预编码一次）
+_CURRENT_MODEL_INFO = {
+    "current_model": {
+        "id": "en_core_web_lg",
+        "name": "English Large Model",
+        "language": "en",
+        "status": "loaded",
+        "last_updated": "2024-04-01T18:00:00Z",
+        "memory_usage": "789MB",
+        "active_workers": 4,
+        "performance_stats": {
+            "requests_processed": 1000,
+            "average_latency": "50ms",
+            "error_rate": "0.1%"
         }
+    },
+    "model_health": {
+        "status": "healthy",
+        "uptime": "24h",
+        "load_average": "45%",
+        "memory_available": "2GB"
     }
+}
+_CURRENT_MODEL_INFO_BODY, _CURRENT_MODEL_INFO_ETAG = _encode_static_json(_CURRENT_MODEL_INFO)
 
 @router.get("/prompt/current-model")
-async def get_current_model():
+async def get_current_model(request: Request) -> Response:
     """获取当前使用的模型信息"""
-    return {
-        "current_model": {
-            "id": "en_core_web_lg",
-            "name": "English Large Model",
-            "language": "en",
-            "status": "loaded",
-            "last_updated": "2024-04-01T18:00:00Z",
-            "memory_usage": "789MB",
-            "active_workers": 4,
-            "performance_stats": {
-                "requests_processed": 1000,
-                "average_latency": "50ms",
-                "error_rate": "0.1%"
-            }
-        },
-        "model_health": {
-            "status": "healthy",
-            "uptime": "24h",
-            "load_average": "45%",
-            "memory_available": "2GB"
-        }
-    }
+    return _static_json_response(request, _CURRENT_MODEL_INFO_BODY, _CURRENT_MODEL_INFO_ETAG)
 
 @router.get("/system/info")
 async def get_system_info(services: Services = Depends(get_services)) -> Dict[str, Any]:
@@ -522,7 +550,7 @@ async def get_system_info(services: Services = Depends(get_services)) -> Dict[st
         pii_detector = services.pii_detector
         return {
             "version": "1.0",
-            "rules_count": len(pii_detector.rules),
+            "rules_count": pii_detector.rules_count,
             "supported_languages": list(settings.PII_SUPPORTED_LANGUAGES),
             "last_updated": datetime.now().isoformat()
         }
@@ -3,15 +3,17 @@ from fastapi import APIRouter, HTTPException, Request, Depends
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
 from enum import Enum
+import logging
 from core.logging import get_logger
 from core.dependencies import get_services, Services
-from services.model_manager import ModelManager
 from core.config import settings
-import json
 
 router = APIRouter()
 logger = get_logger("api.endpoints.prompt")
 
+# 热点接口默认跳过返回值的 response_model 校验，VALIDATE_API_RESPONSE=true 时恢复
+_HOT_RESPONSE_MODEL = Dict[str, Any] if settings.VALIDATE_API_RESPONSE else None
+
 class DetectionMode(str, Enum):
     normal = "normal"      # 基础检测模式
     detailed = "detailed"  # 详细检测模式
@@ -36,6 +38,18 @@ class DetectionRequest(BaseModel):
     mode: DetectionMode = Field(default=DetectionMode.normal, description="检测模式")
     batch: bool = Field(default=False, description="是否批量处理")
 
+class BatchDetectionRequest(BaseModel):
+    texts: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.MAX_BATCH_TEXTS,
+        description="待检测文本列表"
+    )
+    mode: DetectionMode = Field(default=DetectionMode.normal, description="检测模式")
+
+class SetModelRequest(BaseModel):
+    model_id: str = Field(..., description="模型ID")
+
 @router.get("/models")
 async def get_available_models(services = Depends(get_services)) -> Dict[str, Any]:
     """获取可用模型列表"""
@@ -69,11 +83,11 @@ async def get_current_model(services: Services = Depends(get_services)) -> Dict[
         )
 
 @router.post("/set-model")
-async def set_current_model(request: Dict[str, Any], services: Services = Depends(get_services)) -> Dict[str, Any]:
+async def set_current_model(request: SetModelRequest, services: Services = Depends(get_services)) -> Dict[str, Any]:
     """设置当前模型"""
     try:
         model_manager = services.model_manager
-        model_id = request.get("model_id")
+        model_id = request.model_id
         
         if not model_id:
             raise HTTPException(
@@ -88,7 +102,7 @@ async def set_current_model(request: Dict[str, Any], services: Services = Depend
             )
             
         # 更新当前模型
-        model_manager.current_model["id"] = model_id
+        model_manager.set_current_model(model_id)
         return {"status": "success", "message": f"Current model set to {model_id}"}
         
     except Exception as e:
@@ -98,15 +112,15 @@ async def set_current_model(request: Dict[str, Any], services: Services = Depend
             detail=f"Failed to set current model: {str(e)}"
         )
 
-@router.post("/detect")
+@router.post("/detect", response_model=_HOT_RESPONSE_MODEL)
 async def detect_prompt(
-    request: Dict[str, Any],
+    request: DetectionRequest,
     services: Services = Depends(get_services)  # 使用依赖注入
 ) -> Dict[str, Any]:
     """检测提示词注入"""
     try:
-        text = request.get("text", "")
-        mode = request.get("mode", "normal")
+        text = request.text
+        mode = request.mode.value
         
         if not text:
             raise HTTPException(
@@ -114,12 +128,12 @@ async def detect_prompt(
                 detail="Text field is required"
             )
             
-        logger.info(f"User input for detection: {text}")
-        logger.info(f"Detection mode: {mode}")
+        logger.info("User input for detection: %s", text)
+        logger.info("Detection mode: %s", mode)
         
         result = await services.model_manager.detect(text=text, mode=mode)
-        logger.info("Starting API call for prompt detection")
-        logger.info(f"API response: {json.dumps(result, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API response: %s", result)
         return result
         
     except Exception as e:
@@ -129,6 +143,35 @@ async def detect_prompt(
             detail=f"Failed to process prompt detection: {str(e)}"
         )
 
+@router.post("/detect/batch", response_model=_HOT_RESPONSE_MODEL)
+async def detect_prompt_batch(
+    request: BatchDetectionRequest,
+    services: Services = Depends(get_services)
+) -> Dict[str, Any]:
+    """批量检测提示词注入（按批次合并为一次模型前向计算）"""
+    try:
+        logger.info("Batch detection for %d texts, mode: %s", len(request.texts), request.mode.value)
+        
+        results = await services.model_manager.detect_batch(
+            texts=request.texts, mode=request.mode.value
+        )
+        safe_count = sum(1 for r in results if r["is_safe"])
+        return {
+            "results": results,
+            "summary": {
+                "total": len(results),
+                "safe_count": safe_count,
+                "unsafe_count": len(results) - safe_count
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in detect_prompt_batch: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to process batch prompt detection: {str(e)}"
+        )
+
 @router.post("/config/update")
 async def update_config(config: Dict[str, Any], services: Services = Depends(get_services)) -> Dict[str, Any]:
     """更新模型配置"""
@@ -1,6 +1,9 @@
 """API错误处理模块"""
+import itertools
+import os
+import orjson
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from typing import Any, Dict
@@ -9,10 +12,23 @@ from core.logging import get_logger
 # 修正：添加logger名称
 logger = get_logger("api.errors")
 
+# 进程内单调递增的错误编号，加上进程号前缀避免多 worker 之间重复
+_error_counter = itertools.count(1)
+
+# 422 响应的固定外层结构预先编码，每次只需编码 errors 列表
+_VALIDATION_PREFIX = b'{"detail":"Validation Error","errors":'
+_DATA_VALIDATION_PREFIX = b'{"detail":"Data Validation Error","errors":'
+
+def _validation_response(prefix: bytes, errors: Any) -> Response:
+    """拼接预编码的外层结构和 errors 列表，生成 422 响应"""
+    # errors 的 ctx 中可能包含异常对象，无法直接序列化时退化为 str
+    body = prefix + orjson.dumps(errors, default=str) + b"}"
+    return Response(content=body, status_code=422, media_type="application/json")
+
 async def validation_exception_handler(
     request: Request, 
     exc: RequestValidationError
-) -> JSONResponse:
+) -> Response:
     """
     处理FastAPI的请求验证错误
     
@@ -21,21 +37,17 @@ async def validation_exception_handler(
         exc: 验证错误异常
         
     Returns:
-        JSONResponse: 错误响应
+        Response: 错误响应
     """
-    logger.error(f"Validation error for {request.url.path}: {str(exc)}")
-    return JSONResponse(
-        status_code=422,
-        content={
-            "detail": "Validation Error",
-            "errors": exc.errors()
-        }
-    )
+    # exc.errors() 每次调用都会重新构建错误列表，只取一次
+    errors = exc.errors()
+    logger.error("Validation error for %s: %s", request.url.path, exc)
+    return _validation_response(_VALIDATION_PREFIX, errors)
 
 async def pydantic_validation_exception_handler(
     request: Request, 
     exc: ValidationError
-) -> JSONResponse:
+) -> Response:
     """
     处理Pydantic模型验证错误
     
@@ -44,21 +56,16 @@ async def pydantic_validation_exception_handler(
         exc: Pydantic验证错误异常
         
     Returns:
-        JSONResponse: 错误响应
+        Response: 错误响应
     """
-    logger.error(f"Pydantic validation error for {request.url.path}: {str(exc)}")
-    return JSONResponse(
-        status_code=422,
-        content={
-            "detail": "Data Validation Error",
-            "errors": exc.errors()
-        }
-    )
+    errors = exc.errors()
+    logger.error("Pydantic validation error for %s: %s", request.url.path, exc)
+    return _validation_response(_DATA_VALIDATION_PREFIX, errors)
 
 async def general_exception_handler(
     request: Request, 
     exc: Exception
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     处理通用异常
     
@@ -67,12 +74,12 @@ async def general_exception_handler(
         exc: 异常对象
         
     Returns:
-        JSONResponse: 错误响应
+        ORJSONResponse: 错误响应
     """
-    error_id = str(id(exc))
-    logger.error(f"Unhandled error {error_id} for {request.url.path}: {str(exc)}", exc_info=True)
+    error_id = f"{os.getpid():x}-{next(_error_counter):x}"
+    logger.error("Unhandled error %s for %s: %s", error_id, request.url.path, exc, exc_info=True)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal Server Error",
@@ -93,10 +100,8 @@ def get_error_response(status_code: int, message: str, **kwargs: Any) -> Dict[st
     Returns:
         Dict[str, Any]: 错误响应字典
     """
-    response = {
-        "status_code": status_code,
-        "message": message,
-        **kwargs
-    }
-    logger.debug(f"Generated error response: {response}")
-    return response 
\ No newline at end of file
+    logger.debug(
+        "Generated error response: status=%s message=%s extras=%s",
+        status_code, message, kwargs
+    )
+    return {"status_code": status_code, "message": message, **kwargs} 
\ No newline at end of file
@@ -1,13 +1,11 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, FrozenSet, List, Optional, Any
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from pydantic import BaseModel
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
-# 确保在创建 Settings 实例之前加载 .env 文件
-load_dotenv()
-
 class Settings(BaseSettings):
     """应用配置类"""
     PROJECT_NAME: str = "EvydGuard"
@@ -42,9 +40,17 @@ class Settings(BaseSettings):
     
     # PII 规则配置
     PII_RULES_FILE: Path = BASE_DIR / "config" / "pii/pii_rules.json"
+    # 仅使用正则规则时可跳过 spaCy NER，进一步降低每个文档的处理开销
+    PII_DISABLE_NER: bool = os.getenv("PII_DISABLE_NER", "False").lower() == "true"
+    # 启用的 Presidio 预定义实体（逗号分隔，如 "EMAIL_ADDRESS,PHONE_NUMBER"），为空时只运行自定义规则
+    PII_ENABLED_ENTITIES: str = os.getenv("PII_ENABLED_ENTITIES", "")
+    # PhoneRecognizer 匹配和校验的电话号码地区（逗号分隔）
+    PII_PHONE_REGIONS: str = os.getenv("PII_PHONE_REGIONS", "BN,MY,SG")
+    # 用 RE2 执行自定义规则正则（需另行安装 google-re2）：线性时间无回溯，但 \d、\w、\s、\b 只匹配 ASCII
+    PII_USE_RE2: bool = os.getenv("PII_USE_RE2", "False").lower() == "true"
     
     
-    PII_SUPPORTED_LANGUAGES: set = {"en", "ms", "zh"}
+    PII_SUPPORTED_LANGUAGES: FrozenSet[str] = frozenset({"en", "ms", "zh"})
     
     # CONFIG_DIR existence is ensured after creating the Settings instance
     
@@ -58,8 +64,23 @@ class Settings(BaseSettings):
         "ProtectAI/deberta-v3-base-prompt-injection-v2": "ProtectAI's DeBERTa model for prompt injection detection",
     }
     
+    # 是否对热点接口的返回值做 response_model 校验（默认关闭，调试时可开启）
+    VALIDATE_API_RESPONSE: bool = os.getenv("VALIDATE_API_RESPONSE", "False").lower() == "true"
+    
+    # 加载分类模型后对 Linear 层做动态 INT8 量化（仅 CPU），可降低延迟和内存；数值有偏差时关闭即回到 FP32
+    QUANTIZE: bool = os.getenv("QUANTIZE", "False").lower() == "true"
+    # 加载后用 torch.compile 编译分类模型的前向计算（启动时预热一次），编译失败时退回 eager 模式
+    TORCH_COMPILE: bool = os.getenv("TORCH_COMPILE", "False").lower() == "true"
+    # 分类模型推理的动态合批：并发请求最多攒 INFERENCE_MAX_BATCH 条或等待 INFERENCE_MAX_WAIT_MS 毫秒后一次前向计算
+    INFERENCE_MAX_BATCH: int = int(os.getenv("INFERENCE_MAX_BATCH", "16"))
+    INFERENCE_MAX_WAIT_MS: float = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+    # 分类概率缓存：按 (模型, 文本) 精确匹配，命中时跳过分词和前向计算；0 表示关闭
+    INFERENCE_CACHE_SIZE: int = int(os.getenv("INFERENCE_CACHE_SIZE", "4096"))
+    
     # Security Rules
     MAX_INPUT_LENGTH: int = 1000
+    # 单个批量检测请求最多包含的文本条数
+    MAX_BATCH_TEXTS: int = int(os.getenv("MAX_BATCH_TEXTS", "256"))
     SENSITIVE_PATTERNS: Dict[str, str] = {
         "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
         "credit_card": r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",
@@ -69,6 +90,15 @@ class Settings(BaseSettings):
     
     # DeepSeek 配置
     DEEPSEEK_BASE_URL: str = "https://api.deepseek.com"
+    # 批量调用 DeepSeek 时的最大并发请求数
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    # DeepSeek 请求遇到 429/5xx/超时时的最大重试次数（指数退避 + 抖动，遵守 Retry-After）
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    # DeepSeek 响应缓存（按文本、模式和规则版本精确匹配）
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "10000"))
+    LLM_CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "3600"))
+    # Islamic 检测的本地关键词预筛：开启后未命中任何规则关键词的文本直接判定合规，不调用 DeepSeek
+    ISLAMIC_PREFILTER_ENABLED: bool = os.getenv("ISLAMIC_PREFILTER_ENABLED", "False").lower() == "true"
     
     # DeepSeek API settings
     DEEPSEEK_API_KEY: str = os.getenv("DEEPSEEK_API_KEY", "sk-ee2ee84b13384efa9594eda1d1c2f02e")
@@ -95,10 +125,11 @@ class Settings(BaseSettings):
     PYTHONWARNINGS: str = "ignore::UserWarning"
     
     # 允许额外的字段
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-        extra = "allow"  # 允许额外的配置项
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="allow"  # 允许额外的配置项
+    )
     
     # 新增配置项
     PYTHON_MULTIPART: str = "0.0.6"
@@ -108,11 +139,19 @@ class Settings(BaseSettings):
     BCRYPT: str = "4.1.2"
     LOGURU: str = "0.6.0"
 
-# 创建全局设置实例
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """获取全局设置实例（每个进程只解析一次 .env 和校验一次配置）"""
+    # 确保在创建 Settings 实例之前加载 .env 文件
+    load_dotenv()
+    return Settings()
+
+# 兼容旧代码的全局设置实例
+settings = get_settings()
 
 # Ensure CONFIG_DIR exists (created here to avoid pydantic v1/v2 validator incompat)
 os.makedirs(settings.CONFIG_DIR, exist_ok=True)
 
 # 打印调试信息
-print(f"Hugging Face Token loaded: {'Yes' if settings.HUGGINGFACE_TOKEN else 'No'}") 
\ No newline at end of file
+if settings.DEBUG:
+    print(f"Hugging Face Token loaded: {'Yes' if settings.HUGGINGFACE_TOKEN else 'No'}")
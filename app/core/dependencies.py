@@ -1,13 +1,9 @@
 """依赖注入管理"""
-from typing import Generator, TYPE_CHECKING
+import asyncio
+import threading
+from typing import Generator, Optional, TYPE_CHECKING
 from core.logging import get_logger
 from fastapi import Depends
-from services.model_manager import ModelManager
-from services.islamic_context_manager import IslamicContextManager
-from services.pii_detector import PIIDetector
-from services.prompt_checker import PromptChecker
-from services.hikma_detector import HikmaDetector
-from services.promptguard_detector import PromptGuardDetector
 
 # 使用 TYPE_CHECKING 避免循环导入
 if TYPE_CHECKING:
@@ -18,27 +14,50 @@ logger = get_logger(__name__)
 class Services:
     _instance = None
     _initialized = False
+    # 保护单例的构建和初始化，避免冷启动时并发请求重复加载模型
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Services, cls).__new__(cls)
-            # 创建所有服务实例
-            cls._instance.model_manager = ModelManager()
-            cls._instance.islamic_context_manager = IslamicContextManager()
-            cls._instance.pii_detector = PIIDetector()
-            cls._instance.prompt_checker = PromptChecker(cls._instance.model_manager)
-            cls._instance.hikma_detector = HikmaDetector()
-            cls._instance.promptguard_detector = PromptGuardDetector()
+            with cls._lock:
+                if cls._instance is None:
+                    # 服务模块会间接导入 torch/transformers/spacy，延迟到首次构建时再导入，
+                    # 避免 import main 时就加载全部机器学习库
+                    from services.model_manager import ModelManager
+                    from services.islamic_context_manager import get_islamic_context_manager
+                    from services.pii_detector import PIIDetector
+                    from services.prompt_checker import PromptChecker
+                    from services.hikma_detector import HikmaDetector
+                    from services.promptguard_detector import PromptGuardDetector
+                    
+                    instance = super(Services, cls).__new__(cls)
+                    # 创建所有服务实例
+                    instance.model_manager = ModelManager()
+                    instance.islamic_context_manager = get_islamic_context_manager()
+                    instance.pii_detector = PIIDetector()
+                    instance.prompt_checker = PromptChecker(instance.model_manager)
+                    instance.hikma_detector = HikmaDetector()
+                    instance.promptguard_detector = PromptGuardDetector()
+                    # 全部构建完成后再发布，其他线程不会看到半初始化的实例
+                    cls._instance = instance
         return cls._instance
 
     def __init__(self):
         # 确保只初始化一次
         if not Services._initialized:
             self.initialize()
-            Services._initialized = True
 
     def initialize(self) -> None:
-        """初始化所有服务"""
+        """初始化所有服务（唯一的受锁保护的初始化入口，重复调用直接返回）"""
+        if Services._initialized:
+            return
+        with Services._lock:
+            if Services._initialized:
+                return
+            self._initialize_services()
+
+    def _initialize_services(self) -> None:
+        """按依赖顺序初始化各个服务，调用方需持有 _lock"""
         try:
             logger.info("Starting services initialization...")
             
@@ -107,6 +126,25 @@ class Services:
             logger.error(f"Service cleanup failed: {str(e)}")
             raise
 
-def get_services() -> Services:
-    """获取服务实例的依赖注入函数"""
-    return Services()
\ No newline at end of file
+# 进程级缓存的服务实例，避免每个请求重复解析依赖
+_services: Optional[Services] = None
+_services_lock = asyncio.Lock()
+
+async def ensure_initialized() -> Services:
+    """在应用启动时构建并初始化服务单例（模型加载较慢，放到线程池中执行）"""
+    global _services
+    if _services is None:
+        async with _services_lock:
+            if _services is None:
+                loop = asyncio.get_running_loop()
+                _services = await loop.run_in_executor(None, Services)
+    return _services
+
+async def get_services() -> Services:
+    """获取服务实例的依赖注入函数（返回缓存的单例）
+
+    声明为 async，FastAPI 直接在事件循环中调用，不再为每个请求切换到线程池。
+    """
+    if _services is not None:
+        return _services
+    return await ensure_initialized()
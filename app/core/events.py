@@ -1,45 +1,38 @@
 """应用事件处理"""
 from fastapi import FastAPI
-import asyncio
 from contextlib import asynccontextmanager
 
 from core.logging import get_logger
-from core.dependencies import get_services
-from core.config import settings
+from core.dependencies import ensure_initialized
 
 logger = get_logger("core.events")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
-    # 启动时执行
-    logger.info("Starting application...")
-    
-    # 预加载模型
+    # 启动时执行：服务只在这里构建和初始化一次（包括模型预加载和规则加载）
     try:
-        logger.info("Starting model preload...")
-        services = get_services()
-        
-        # 预加载英文和马来文伊斯兰规则
-        islamic_manager = services.islamic_context_manager
-        en_rules = islamic_manager.load_rules("en")
-        ms_rules = islamic_manager.load_rules("ms")
-        logger.info(f"Preloaded Islamic rules for languages: en, ms")
-        
-        await services.model_manager.preload_models()
-        logger.info("Model preload completed successfully")
+        logger.info("Starting application...")
+        services = await ensure_initialized()
+        # 缓存到 app.state 供请求复用
+        app.state.services = services
+        logger.info("Application started successfully")
     except Exception as e:
-        logger.error(f"Error during preload: {str(e)}")
-        # 允许程序继续，但记录错误
+        logger.error(f"Error during startup: {str(e)}")
+        raise
     
     # 启动完成，进入应用运行阶段
     yield
     
     # 关闭时执行清理
-    logger.info("Shutting down application...")
-    # 可以在这里添加资源清理代码
-    logger.info("Application shutdown complete")
+    try:
+        logger.info("Shutting down application...")
+        await services.cleanup()
+        logger.info("Application shutdown completed")
+    except Exception as e:
+        logger.error(f"Error during shutdown: {str(e)}")
+        raise
 
 def setup_app_events(app: FastAPI) -> None:
     """配置应用事件处理器"""
-    app.router.lifespan_context = lifespan 
\ No newline at end of file
+    app.router.lifespan_context = lifespan
@@ -1,8 +1,11 @@
 """日志配置模块"""
+import atexit
 import logging
+import queue
 import sys
+from functools import lru_cache
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from core.config import settings
 
@@ -19,6 +22,34 @@ formatter = logging.Formatter(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+def _create_listener() -> QueueListener:
+    """创建后台日志线程，由它独占控制台和文件处理器"""
+    # 创建控制台处理器
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    console_handler.setLevel(logging.INFO)
+    
+    # 创建文件处理器
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.INFO)
+    
+    return QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+
+# 请求线程只负责入队，格式化和磁盘写入都在监听线程中完成
+log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+log_listener = _create_listener()
+log_listener.start()
+atexit.register(log_listener.stop)
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str) -> logging.Logger:
     """
     设置并返回logger
@@ -31,31 +62,18 @@ def setup_logger(name: str) -> logging.Logger:
     """
     logger = logging.getLogger(name)
     
-    # 如果logger已经有handlers，说明已经配置过，直接返回
-    if logger.handlers:
+    # 子logger不挂处理器，日志向上传播给 "app" 统一处理
+    if name != "app":
+        logger.propagate = True
         return logger
-        
-    # 设置日志级别
-    logger.setLevel(logging.INFO)
     
-    # 创建控制台处理器
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.INFO)
-    logger.addHandler(console_handler)
+    # 设置日志级别（lru_cache 保证 "app" 只会配置一次）
+    logger.setLevel(logging.INFO)
     
-    # 创建文件处理器
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5,
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+    # 日志记录放入队列，由后台监听线程写出
+    logger.addHandler(QueueHandler(log_queue))
     
-    # 设置不向上传播
+    # "app" 不再向 Python 根logger传播，避免重复输出
     logger.propagate = False
     
     return logger
@@ -63,6 +81,7 @@ def setup_logger(name: str) -> logging.Logger:
 # 创建根logger
 root_logger = setup_logger("app")
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
     获取logger实例
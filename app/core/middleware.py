@@ -1,28 +1,51 @@
+import logging
 from fastapi import Request
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from core.logging import get_logger
+from api.errors import general_exception_handler
 
 logger = get_logger("core.middleware")
 
-class APIErrorMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class APIErrorMiddleware:
+    """纯 ASGI 中间件：记录 404 请求并兜底未处理异常
+
+    不继承 BaseHTTPMiddleware，避免每个请求额外创建任务和内存流。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                # 记录404错误的详细信息
+                if message["status"] == 404:
+                    logger.warning("404 Not Found: %s %s", scope["method"], scope["path"])
+                    # 请求头和查询参数只在 DEBUG 级别下才复制输出
+                    if logger.isEnabledFor(logging.DEBUG):
+                        request = Request(scope)
+                        logger.debug(
+                            "404 details - Headers: %s, Query Params: %s",
+                            dict(request.headers),
+                            dict(request.query_params),
+                        )
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # 记录404错误的详细信息
-            if response.status_code == 404:
-                logger.warning(
-                    f"404 Not Found: {request.method} {request.url.path}\n"
-                    f"Headers: {dict(request.headers)}\n"
-                    f"Query Params: {dict(request.query_params)}"
-                )
-            
-            return response
-            
-        except Exception as e:
-            logger.exception("Unhandled error in request pipeline")
-            return JSONResponse(
-                status_code=500,
-                content={"detail": "Internal server error"}
-            ) 
\ No newline at end of file
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # 响应头已发出时无法再返回 500，只能交给服务器断开连接
+            if response_started:
+                logger.exception("Unhandled error in request pipeline")
+                raise
+            # 与全局异常处理器返回同样带 error_id 的 500 响应（日志也由它记录）
+            response = await general_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
@@ -1,12 +1,14 @@
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from .config import settings
 from .logging import get_logger
 
-logger = get_logger()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = get_logger("core.security")
+
+# 预先构建转义表，sanitize_input 只需一次 translate 遍历
+_HTML_ESCAPE = str.maketrans({
+    "<": "&lt;",
+    ">": "&gt;",
+    "'": "&#x27;",
+    '"': "&quot;",
+})
 
 
 def sanitize_input(text: str) -> str:
@@ -14,6 +16,4 @@ def sanitize_input(text: str) -> str:
     Basic input sanitization to prevent XSS and other injection attacks.
     """
     # Remove potentially dangerous characters
-    sanitized = text.replace("<", "&lt;").replace(">", "&gt;")
-    sanitized = sanitized.replace("'", "&#x27;").replace('"', "&quot;")
-    return sanitized 
\ No newline at end of file
+    return text.translate(_HTML_ESCAPE) 
\ No newline at end of file
@@ -1,32 +1,52 @@
 """
 FastAPI 应用主入口
 """
-# 标准库导入
-import asyncio
-from typing import Optional
-
 # 第三方库导入
 from fastapi import FastAPI
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
 
 # 本地导入
 from core.logging import get_logger
-from core.config import settings
-from core.dependencies import Services
+from core.config import get_settings
+from core.events import lifespan
+from core.middleware import APIErrorMiddleware
 from api.api import api_router
+from api.errors import (
+    general_exception_handler,
+    pydantic_validation_exception_handler,
+    validation_exception_handler,
+)
 
 # 初始化日志
 logger = get_logger(__name__)
 
 def create_app() -> FastAPI:
     """创建并配置 FastAPI 应用"""
+    settings = get_settings()
     app = FastAPI(
         title=settings.PROJECT_NAME,
         description=settings.PROJECT_DESCRIPTION,
         version=settings.VERSION,
-        openapi_url=f"{settings.API_V1_STR}/openapi.json"
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        default_response_class=ORJSONResponse,
+        # 所有路由均无尾斜杠，关闭重定向匹配以省去额外的路径规范化
+        redirect_slashes=False,
+        # 服务初始化与清理统一在 lifespan 中完成
+        lifespan=lifespan
     )
     
+    # 注册异常处理器：422 使用预编码的错误结构，其余未处理异常返回带 error_id 的 500
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.add_exception_handler(ValidationError, pydantic_validation_exception_handler)
+    app.add_exception_handler(Exception, general_exception_handler)
+    
+    # 记录 404 并兜底路由中的未处理异常；最先添加即位于最内层，其 500 响应同样经过 CORS 和压缩
+    app.add_middleware(APIErrorMiddleware)
+    
     # 配置 CORS
     app.add_middleware(
         CORSMiddleware,
@@ -36,57 +56,32 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # 压缩较大的 JSON 响应（如 technical-info、规则列表）
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    
     # 注册 API 路由
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
-    # 初始化全局服务实例
-    Services()
-    
     return app
 
 # 创建应用实例
 app = create_app()
 
-# 全局服务实例
-services: Optional[Services] = None
-
-@app.on_event("startup")
-async def startup_event():
-    """应用启动事件处理"""
-    try:
-        logger.info("Starting application...")
-        global services
-        
-        # 初始化服务
-        services = Services()
-        services.initialize()
-        
-        logger.info("Application started successfully")
-    except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
-        raise
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """应用关闭事件处理"""
-    try:
-        logger.info("Shutting down application...")
-        global services
-        
-        if services:
-            await services.cleanup()
-            
-        logger.info("Application shutdown completed")
-    except Exception as e:
-        logger.error(f"Error during shutdown: {str(e)}")
-        raise
-
 if __name__ == "__main__":
+    import os
     import uvicorn
+    
+    settings = get_settings()
+    # 开发时通过 RELOAD=true 开启热重载；热重载模式下 uvicorn 只能使用单进程
+    reload = os.getenv("RELOAD", str(settings.DEBUG)).lower() == "true"
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
+        reload=reload,
+        # 每个 worker 都会加载一份模型，默认单进程，按内存通过 WEB_CONCURRENCY 调整
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
         log_level="info"
-    )
\ No newline at end of file
+    )
@@ -42,6 +42,28 @@ class IslamicDetectionRequest(BaseModel):
     text: str
     mode: str = "normal"
 
+class IslamicChatRequest(BaseModel):
+    """Chat request model"""
+    text: str
+    use_islamic_context: bool = False
+
+class IslamicBatchDetectionRequest(BaseModel):
+    """Batch detection request model"""
+    texts: List[str] = Field(..., min_length=1)
+    mode: str = "normal"
+
+class IslamicBatchChatRequest(BaseModel):
+    """Batch chat request model"""
+    texts: List[str] = Field(..., min_length=1)
+    use_islamic_context: bool = False
+
+class IslamicDetectionAnalysis(BaseModel):
+    """Structured DeepSeek detection result"""
+    is_compliant: bool = True
+    categories: List[str] = Field(default_factory=list)
+    confidence: float = 0.0
+    warnings: List[str] = Field(default_factory=list)
+
 class IslamicRuleUpdate(BaseModel):
     rules: List[IslamicRule]
 
@@ -1,10 +1,12 @@
 """PII检测相关数据模型"""
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 class PIIRule(BaseModel):
     """PII规则模型"""
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     type: str
@@ -36,13 +38,14 @@ class PIIDetectionRequest(BaseModel):
     mask_types: Optional[List[str]] = None
     mask_method: Optional[str] = "partial"
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "text": "My name is John Doe, email: john@example.com",
                 "language": "en"
             }
         }
+    )
 
 class PIIEntity(BaseModel):
     """PII实体模型"""
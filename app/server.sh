@@ -4,4 +4,4 @@
 export PYTHONPATH=$PYTHONPATH:/Users/tangyu/Projects/MAF
 
 # 启动 FastAPI 服务器
-uvicorn main:app --host 0.0.0.0 --port 8001 --reload 
\ No newline at end of file
+uvicorn main:app --host 0.0.0.0 --port 8001 --loop uvloop --http httptools --reload 
\ No newline at end of file
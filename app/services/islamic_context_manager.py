@@ -1,25 +1,111 @@
 """Islamic context manager for LLM responses"""
+import asyncio
+import copy
+import hashlib
+import io
 import os
 import json
-from typing import Dict, List, Any
-import requests
+import logging
+import re
+import time
+import unicodedata
+import httpx
+import orjson
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from core.logging import get_logger
 from core.config import settings
-from openai import OpenAI
+from pydantic import ValidationError
+from models.islamic import IslamicDetectionAnalysis
 from pathlib import Path
 from datetime import datetime
 
 logger = get_logger(__name__)
 
+# 预筛关键词提取：忽略过短的词和没有区分度的常用词
+_KEYWORD_TOKEN = re.compile(r"[A-Za-z][A-Za-z']{3,}")
+_KEYWORD_STOPWORDS = frozenset({
+    "about", "against", "content", "from", "into", "other", "that", "their",
+    "these", "this", "those", "towards", "with", "within", "without",
+})
+
+# 缓存键和预筛使用的文本规范化：NFKC + casefold + 合并空白
+_WHITESPACE = re.compile(r"\s+")
+
+def _normalize_text(text: str) -> str:
+    """规范化文本，使仅空白、大小写或 Unicode 兼容形式不同的输入得到相同结果"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+# 检测用系统提示：要求 DeepSeek 以 JSON 对象返回，便于直接解析为 IslamicDetectionAnalysis
+_DETECT_SYSTEM_PROMPT = """You are an expert in Islamic context analysis.
+Analyze the given text and determine if it contains Islamic context, terms, or references,
+and whether it is compliant with Islamic principles.
+Respond only with a JSON object of the form:
+{"is_compliant": true, "categories": ["..."], "confidence": 0.0, "warnings": ["..."]}
+where confidence is a number between 0 and 1."""
+
+# 预生成系统提示词的格式版本：修改提示词模板或构建逻辑时递增，使磁盘上的旧文件失效
+_PROMPT_FORMAT_VERSION = "1"
+# 预生成提示词文件首行记录有效性键，格式为 "#key:<hex>"
+_PROMPT_KEY_PREFIX = "#key:"
+
+# 语言代码只允许字母和连字符，防止拼接规则文件路径时越出规则目录
+_LANGUAGE_CODE = re.compile(r"^[A-Za-z-]{2,10}$")
+
+@lru_cache(maxsize=64)
+def _parse_rules_file(path: str, mtime: float) -> Dict[str, Any]:
+    """按 (路径, 修改时间) 缓存解析后的规则文件，文件修改后自动重新读取；缓存对象只读，不可交给调用方修改"""
+    return orjson.loads(Path(path).read_bytes())
+
+def _load_rules_file(path: str, mtime: float) -> Dict[str, Any]:
+    """返回缓存规则的深拷贝，调用方对规则的修改不会污染缓存"""
+    return copy.deepcopy(_parse_rules_file(path, mtime))
+
 class IslamicContextManager:
     """Islamic context manager for LLM responses"""
+    # 属性固定，使用槽位存储代替实例 __dict__
+    __slots__ = (
+        "_initialized",
+        "client",
+        "_http",
+        "rules_data",
+        "rules",
+        "_rules_mtimes",
+        "_sem",
+        "_cache",
+        "_rules_hash",
+        "_cached_system_prompt",
+        "_cached_rules_prompt",
+        "_rules_by_category",
+        "_guidelines_lines",
+        "_forbidden_lines",
+        "_prefilter",
+    )
+
     def __init__(self):
         """初始化伊斯兰上下文管理器"""
         logger.info("Initializing Islamic Context Manager...")
         self._initialized = False
         self.client = None
+        self._http: Optional[httpx.AsyncClient] = None
         self.rules_data = {}  # 初始化规则数据字典
         self.rules = []  # 初始化规则列表
+        self._rules_mtimes: Dict[str, float] = {}  # 各语言规则文件载入时的修改时间
+        # 限制批量接口同时发往 DeepSeek 的请求数
+        self._sem = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        # DeepSeek 响应缓存：key -> (写入时间, 响应内容)，按 LRU 顺序淘汰
+        self._cache: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._rules_hash = ""
+        # 规则变化时预先生成的提示词，chat 时直接复用
+        self._cached_system_prompt: Optional[str] = None
+        self._cached_rules_prompt: Optional[str] = None
+        # 按语言预先分组的规则 (name, description) 以及格式化好的指南/禁止主题行
+        self._rules_by_category: Dict[str, Dict[str, List[Tuple[str, str]]]] = {}
+        self._guidelines_lines: Dict[str, List[str]] = {}
+        self._forbidden_lines: Dict[str, List[str]] = {}
+        # 由英文规则关键词编译成的单个正则，一次扫描即可判断是否命中任何关键词
+        self._prefilter: Optional["re.Pattern[str]"] = None
 
     def initialize(self) -> None:
         """Initialize manager and load rules"""
@@ -32,9 +118,23 @@ class IslamicContextManager:
             # Initialize OpenAI client (for DeepSeek API)
             api_key = settings.DEEPSEEK_API_KEY
             if api_key and api_key != "your-deepseek-api-key-here":
-                self.client = OpenAI(
+                # 共享的 HTTP/2 连接池：并发请求复用同一条 TLS 连接，瞬时网络错误由传输层重试
+                self._http = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(
+                        http2=True,
+                        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                        retries=2
+                    ),
+                    timeout=httpx.Timeout(60.0, connect=5.0)
+                )
+                # openai 只在配置了 API key 时才导入，未使用 DeepSeek 的部署不承担其导入开销
+                from openai import AsyncOpenAI
+                self.client = AsyncOpenAI(
                     api_key=api_key,
-                    base_url=settings.DEEPSEEK_BASE_URL
+                    base_url=settings.DEEPSEEK_BASE_URL,
+                    http_client=self._http,
+                    # 限流和瞬时错误在客户端内部退避重试，不必让整个请求失败
+                    max_retries=settings.LLM_MAX_RETRIES
                 )
                 logger.info("DeepSeek API client initialized")
             else:
@@ -52,29 +152,145 @@ class IslamicContextManager:
             self._initialized = False
             raise
 
-    def _call_deepseek_api(self, text: str) -> str:
+    def _refresh_rules_hash(self) -> None:
+        """规则变化后重新计算规则摘要，使旧的缓存条目不再命中"""
+        payload = json.dumps(self.rules_data, sort_keys=True, ensure_ascii=False, default=str)
+        self._rules_hash = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+    def _index_rules(self) -> None:
+        """按语言把规则预先分组为 {类别: [(name, description)]}，并格式化指南和禁止主题行"""
+        self._rules_by_category = {}
+        self._guidelines_lines = {}
+        self._forbidden_lines = {}
+        for lang, data in self.rules_data.items():
+            if not isinstance(data, dict):
+                continue
+            by_category: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+            for rule in data.get("rules", []):
+                by_category[rule.get("category", "other")].append(
+                    (rule.get("name", ""), rule.get("description", ""))
+                )
+            self._rules_by_category[lang] = dict(by_category)
+            self._guidelines_lines[lang] = [f"- {g}" for g in data.get("guidelines", [])]
+            self._forbidden_lines[lang] = [f"- {t}" for t in data.get("forbidden_topics", [])]
+        self._prefilter = self._build_prefilter(self.rules_data.get("en", {}))
+
+    @staticmethod
+    def _build_prefilter(data: Dict[str, Any]) -> Optional["re.Pattern[str]"]:
+        """把禁止主题、规则名称和规则 keywords 中的关键词编译为一个忽略大小写的交替正则"""
+        if not isinstance(data, dict):
+            return None
+        phrases = list(data.get("forbidden_topics", []))
+        keywords = set()
+        for rule in data.get("rules", []):
+            phrases.append(rule.get("name", ""))
+            keywords.update(_normalize_text(k) for k in rule.get("keywords", []) if k)
+        for phrase in phrases:
+            keywords.update(
+                _normalize_text(token) for token in _KEYWORD_TOKEN.findall(phrase)
+                if token.lower() not in _KEYWORD_STOPWORDS
+            )
+        keywords.discard("")
+        if not keywords:
+            return None
+        # 长关键词优先，避免被其前缀抢先匹配
+        alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+    def _refresh_prompt_cache(self, system_prompt: Optional[str] = None) -> None:
+        """规则变化后重新生成系统提示词和规则提示词，已从磁盘读到的系统提示词直接使用"""
+        self._index_rules()
+        self._cached_system_prompt = system_prompt or self._build_system_prompt_impl()
+        self._cached_rules_prompt = self._format_rules_for_prompt_impl()
+
+    @staticmethod
+    def _prompt_file(rules_file: Path) -> Path:
+        """与规则 JSON 同目录的预生成系统提示词文件，如 islamic_rules_en.prompt.txt"""
+        return rules_file.with_suffix(".prompt.txt")
+
+    def _prompt_key(self) -> str:
+        """预生成提示词的有效性键：英文规则内容与提示词格式版本的摘要，与文件修改时间无关"""
+        digest = hashlib.blake2b(_PROMPT_FORMAT_VERSION.encode(), digest_size=16)
+        digest.update(orjson.dumps(self.rules_data.get("en", {}), option=orjson.OPT_SORT_KEYS))
+        return digest.hexdigest()
+
+    def _read_prompt_file(self, rules_file: Path) -> Optional[str]:
+        """读取预生成的系统提示词；文件缺失或首行的键与当前规则不符时返回 None"""
+        prompt_file = self._prompt_file(rules_file)
+        try:
+            header, _, prompt = prompt_file.read_text(encoding="utf-8").partition("\n")
+        except (OSError, UnicodeDecodeError):
+            return None
+        if header != _PROMPT_KEY_PREFIX + self._prompt_key():
+            return None
+        return prompt or None
+
+    def _write_prompt_file(self, rules_file: Path) -> None:
+        """把当前系统提示词写到规则 JSON 旁边，其他 worker 启动时直接读取而不必重新构建"""
+        if not self._cached_system_prompt:
+            return
+        prompt_file = self._prompt_file(rules_file)
+        # 先写临时文件再替换，多个 worker 同时写入时读者不会读到半个文件
+        tmp_file = prompt_file.with_name(f"{prompt_file.name}.{os.getpid()}.tmp")
+        try:
+            content = f"{_PROMPT_KEY_PREFIX}{self._prompt_key()}\n{self._cached_system_prompt}"
+            tmp_file.write_bytes(content.encode("utf-8"))
+            os.replace(tmp_file, prompt_file)
+        except OSError as e:
+            logger.warning("Could not write system prompt file %s: %s", prompt_file, e)
+
+    def _cache_key(self, kind: str, text: str) -> bytes:
+        """缓存键：(调用类型, 规则版本, 规范化文本) 的 blake2b 摘要"""
+        return hashlib.blake2b(
+            f"{kind}|{self._rules_hash}|{_normalize_text(text)}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """读取未过期的缓存响应"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created_at, value = entry
+        if time.monotonic() - created_at > settings.LLM_CACHE_TTL:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: bytes, value: str) -> None:
+        """写入缓存，超过容量时淘汰最久未使用的条目"""
+        self._cache[key] = (time.monotonic(), value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.LLM_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    async def _call_deepseek_api(self, text: str) -> str:
         """调用 DeepSeek API 进行 Islamic 上下文检测"""
         try:
             if not self.client:
                 raise ValueError("DeepSeek API client not initialized. Check DEEPSEEK_API_KEY configuration.")
 
-            logger.info("Calling DeepSeek API for Islamic context detection")
+            cache_key = self._cache_key("detect", text)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.debug("DeepSeek detection cache hit")
+                return cached
 
-            system_prompt = """You are an expert in Islamic context analysis.
-            Analyze the given text and determine if it contains Islamic context, terms, or references.
-            Provide a detailed analysis with confidence score and categories."""
+            logger.info("Calling DeepSeek API for Islamic context detection")
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="deepseek-chat",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": _DETECT_SYSTEM_PROMPT},
                     {"role": "user", "content": text}
                 ],
+                response_format={"type": "json_object"},
                 stream=False
             )
 
             result = response.choices[0].message.content
             logger.info("Successfully received response from DeepSeek API")
+            self._cache_put(cache_key, result)
             return result
 
         except Exception as e:
@@ -82,26 +298,33 @@ class IslamicContextManager:
             raise
 
     def _format_rules_for_prompt(self) -> str:
+        """Format rules for prompt (cached until rules change)"""
+        if self._cached_rules_prompt is None:
+            self._cached_rules_prompt = self._format_rules_for_prompt_impl()
+        return self._cached_rules_prompt
+
+    def _format_rules_for_prompt_impl(self) -> str:
         """Format rules for prompt"""
-        rules_text = []
+        if "en" not in self._guidelines_lines:
+            self._index_rules()
+
+        # 直接写入同一个缓冲区，不再为每条规则生成中间字符串
+        buf = io.StringIO()
+        buf.write("Guidelines:\n")
+        buf.write("\n".join(self._guidelines_lines.get("en", [])))
+        buf.write("\n\nForbidden Topics:\n")
+        buf.write("\n".join(self._forbidden_lines.get("en", [])))
+        buf.write("\n\nSpecific Rules:\n")
+        separator = "- "
         for rule in self.rules:
             if rule.get("enabled", True):
-                rules_text.append(f"- {rule['name']}: {rule['description']}")
-
-        rules_data = self.rules_data.get("en", {})
-        guidelines = rules_data.get("guidelines", [])
-        forbidden = rules_data.get("forbidden_topics", [])
+                buf.write(separator)
+                buf.write(rule["name"])
+                buf.write(": ")
+                buf.write(rule["description"])
+                separator = "\n- "
         
-        formatted_text = "\n".join([
-            "Guidelines:",
-            "\n".join(f"- {g}" for g in guidelines),
-            "\nForbidden Topics:",
-            "\n".join(f"- {f}" for f in forbidden),
-            "\nSpecific Rules:",
-            "\n".join(rules_text)
-        ])
-        
-        return formatted_text
+        return buf.getvalue()
 
     async def detect(self, text: str, mode: str = "normal") -> Dict[str, Any]:
         """检测文本的 Islamic 合规性"""
@@ -109,22 +332,42 @@ class IslamicContextManager:
             self.initialize()
 
         try:
+            # 本地预筛：未命中任何规则关键词时直接判定合规，省去一次 DeepSeek 调用
+            if (
+                settings.ISLAMIC_PREFILTER_ENABLED
+                and self._prefilter is not None
+                and self._prefilter.search(_normalize_text(text)) is None
+            ):
+                logger.debug("Islamic prefilter found no rule keywords, skipping DeepSeek")
+                return {
+                    "original_text": text,
+                    "mode": mode,
+                    "response": None,
+                    "is_compliant": True,
+                    "analysis": {
+                        "categories": [],
+                        "confidence": 0.0,
+                        "warnings": []
+                    }
+                }
+
             if not self.client:
                 raise ValueError("DeepSeek API not configured. Set a valid DEEPSEEK_API_KEY to enable this feature.")
 
-            logger.info(f"Detecting compliance with text: {text}, mode: {mode}")
-            api_response = self._call_deepseek_api(text)
+            logger.info("Detecting compliance with text: %s, mode: %s", text, mode)
+            api_response = await self._call_deepseek_api(text)
             
             # 解析响应
+            analysis = self._parse_detection(api_response)
             result = {
                 "original_text": text,
                 "mode": mode,
                 "response": api_response,
-                "is_compliant": True,  # 默认合规
+                "is_compliant": analysis.is_compliant,
                 "analysis": {
-                    "categories": [],
-                    "confidence": 0.0,
-                    "warnings": []
+                    "categories": analysis.categories,
+                    "confidence": analysis.confidence,
+                    "warnings": analysis.warnings
                 }
             }
             
@@ -134,20 +377,42 @@ class IslamicContextManager:
             logger.error(f"Error in compliance detection: {str(e)}")
             raise
 
+    @staticmethod
+    def _parse_detection(api_response: Optional[str]) -> IslamicDetectionAnalysis:
+        """把 DeepSeek 返回的 JSON 直接解析为 IslamicDetectionAnalysis，格式不符时退回默认值（合规）"""
+        if not api_response:
+            return IslamicDetectionAnalysis()
+        try:
+            return IslamicDetectionAnalysis.model_validate_json(api_response)
+        except ValidationError as e:
+            logger.warning("Unparseable DeepSeek detection response: %s", e)
+            return IslamicDetectionAnalysis()
+
+    async def detect_many(self, texts: List[str], mode: str = "normal") -> List[Dict[str, Any]]:
+        """并发检测多段文本，并发数受 LLM_MAX_CONCURRENCY 限制，结果顺序与输入一致"""
+        async def _detect_one(text: str) -> Dict[str, Any]:
+            async with self._sem:
+                return await self.detect(text, mode=mode)
+
+        return await asyncio.gather(*(_detect_one(text) for text in texts))
+
     def get_rules(self, language: str = "en") -> Dict[str, Any]:
         """获取指定语言的规则配置"""
         if not self._initialized:
             self.initialize()
         
-        logger.info(f"Getting rules for language: {language}")
+        logger.info("Getting rules for language: %s", language)
+        
+        # 按需载入（或在文件修改后重新载入）请求的语言
+        self._ensure_language_loaded(language)
         
         # 检查请求的语言是否存在
         if language in self.rules_data:
-            logger.info(f"Found rules for requested language: {language}")
+            logger.info("Found rules for requested language: %s", language)
             return self.rules_data[language]
         
         # 如果请求的语言不存在，尝试使用英文版本
-        if "en" in self.rules_data:
+        if self._ensure_language_loaded("en"):
             logger.warning(f"Rules not found for language {language}, falling back to English")
             return self.rules_data["en"]
         
@@ -160,68 +425,107 @@ class IslamicContextManager:
         if not self._initialized:
             self.initialize()
         
+        for rules_file in Path(settings.ISLAMIC_RULES_DIR).glob("islamic_rules_*.json"):
+            self._ensure_language_loaded(rules_file.stem.split('_')[-1])
         return self.rules_data
 
-    def update_rules(self, rules: List[Dict[str, Any]]) -> bool:
+    async def update_rules(self, rules: List[Dict[str, Any]]) -> bool:
         """Update rules"""
         try:
             if not self._initialized:
                 self.initialize()
 
-            self.rules = rules
-            # Update rules_data as well
+            # 先在副本上构建新规则并保存，保存成功后才切换内存状态；保存失败时线上规则保持不变
+            new_data = None
             if "en" in self.rules_data:
-                self.rules_data["en"]["rules"] = rules
+                new_data = {**self.rules_data["en"], "rules": rules}
+                mtime = await self._save_rules_async(new_data)
+
+            self.rules = rules
+            if new_data is not None:
+                self.rules_data["en"] = new_data
+                # 记下新的修改时间避免重新载入，并同步提示词文件
+                self._rules_mtimes["en"] = mtime
+            self._refresh_rules_hash()
+            self._refresh_prompt_cache()
+            if new_data is not None:
+                rules_file = Path(settings.ISLAMIC_RULES_DIR) / "islamic_rules_en.json"
+                await asyncio.to_thread(self._write_prompt_file, rules_file)
             return True
         except Exception as e:
             logger.error(f"Error updating rules: {str(e)}")
             return False
 
     def load_rules(self) -> None:
-        """加载所有语言的 Islamic 规则配置"""
+        """加载 Islamic 规则配置：启动时只载入英文规则，其他语言在首次请求时按需载入"""
         try:
             rules_dir = Path(settings.ISLAMIC_RULES_DIR)
             if not rules_dir.exists():
                 logger.warning(f"Rules directory not found: {rules_dir}, creating default rules")
-                os.makedirs(rules_dir, exist_ok=True)
+                rules_dir.mkdir(parents=True, exist_ok=True)
                 self._create_and_save_default_rules()
                 return
 
             # 清空现有规则数据
             self.rules_data = {}
+            self._rules_mtimes = {}
+            self.rules = []
             
-            # 遍历所有规则文件
-            for rules_file in rules_dir.glob("islamic_rules_*.json"):
-                try:
-                    # 从文件名提取语言代码
-                    lang_code = rules_file.stem.split('_')[-1]
-                    logger.info(f"Loading rules for language: {lang_code}")
-                    
-                    with open(rules_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        self.rules_data[lang_code] = data
-                        
-                        # 打印每种语言的规则统计
-                        self._log_rules_statistics(data, lang_code)
-                        
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON in rules file {rules_file}: {e}")
-                except Exception as e:
-                    logger.error(f"Error reading rules file {rules_file}: {e}")
-                    continue
-            
-            # 如果没有找到任何规则文件，创建默认英文规则
-            if not self.rules_data:
-                logger.warning("No valid rules files found, creating default English rules")
-                self._create_and_save_default_rules()
-                
-            # 设置默认规则为英文版本
-            self.rules = self.rules_data.get("en", {}).get("rules", [])
+            if not self._ensure_language_loaded("en"):
+                # 如果没有找到任何规则文件，创建默认英文规则
+                if not any(rules_dir.glob("islamic_rules_*.json")):
+                    logger.warning("No valid rules files found, creating default English rules")
+                    self._create_and_save_default_rules()
+                else:
+                    self._refresh_rules_hash()
+                    self._refresh_prompt_cache()
                 
         except Exception as e:
             logger.error(f"Error in load_rules: {str(e)}")
             raise
 
+    def _ensure_language_loaded(self, language: str) -> bool:
+        """确保指定语言的规则已载入且与磁盘文件一致，返回该语言规则是否可用"""
+        if not _LANGUAGE_CODE.match(language):
+            return language in self.rules_data
+        
+        rules_file = Path(settings.ISLAMIC_RULES_DIR) / f"islamic_rules_{language}.json"
+        try:
+            mtime = rules_file.stat().st_mtime
+        except OSError:
+            return language in self.rules_data
+        
+        if self._rules_mtimes.get(language) == mtime:
+            return True
+        
+        try:
+            logger.info(f"Loading rules for language: {language}")
+            data = _load_rules_file(str(rules_file.resolve()), mtime)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in rules file {rules_file}: {e}")
+            return language in self.rules_data
+        except Exception as e:
+            logger.error(f"Error reading rules file {rules_file}: {e}")
+            return language in self.rules_data
+        
+        self.rules_data[language] = data
+        self._rules_mtimes[language] = mtime
+        
+        # 打印每种语言的规则统计
+        self._log_rules_statistics(data, language)
+        
+        self._refresh_rules_hash()
+        # 设置默认规则为英文版本；系统提示词优先读取预生成文件，与当前规则不符时重新构建并写回
+        if language == "en":
+            self.rules = data.get("rules", [])
+            system_prompt = self._read_prompt_file(rules_file)
+            self._refresh_prompt_cache(system_prompt)
+            if system_prompt is None:
+                self._write_prompt_file(rules_file)
+        else:
+            self._refresh_prompt_cache(self._cached_system_prompt)
+        return True
+
     def _create_and_save_default_rules(self) -> None:
         """创建并保存默认规则"""
         try:
@@ -259,14 +563,18 @@ class IslamicContextManager:
             
             # 保存默认规则
             rules_file = Path(settings.ISLAMIC_RULES_DIR) / "islamic_rules_en.json"
-            os.makedirs(settings.ISLAMIC_RULES_DIR, exist_ok=True)
+            rules_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(default_rules, f, indent=2, ensure_ascii=False)
+            with open(rules_file, 'wb') as f:
+                f.write(orjson.dumps(default_rules, option=orjson.OPT_INDENT_2))
                 
             logger.info(f"Created default rules file at {rules_file}")
-            self.rules_data = default_rules
+            self.rules_data = {"en": default_rules}
+            self._rules_mtimes = {"en": rules_file.stat().st_mtime}
             self.rules = default_rules.get("rules", [])
+            self._refresh_rules_hash()
+            self._refresh_prompt_cache()
+            self._write_prompt_file(rules_file)
             
             # 打印默认规则统计
             self._log_rules_statistics(default_rules, "en")
@@ -277,6 +585,9 @@ class IslamicContextManager:
 
     def _log_rules_statistics(self, data: Dict[str, Any], language: str) -> None:
         """记录规则统计信息"""
+        # 未开启 INFO 日志时跳过统计和分类计数
+        if not logger.isEnabledFor(logging.INFO):
+            return
         try:
             # 基本统计
             num_rules = len(data.get("rules", []))
@@ -284,43 +595,56 @@ class IslamicContextManager:
             num_forbidden = len(data.get("forbidden_topics", []))
             num_categories = len(data.get("categories", []))
             
-            logger.info(f"Islamic rules configuration loaded for language {language}:")
-            logger.info(f"- Version: {data.get('version', 'N/A')}")
-            logger.info(f"- Last updated: {data.get('last_updated', 'N/A')}")
-            logger.info(f"- Total rules: {num_rules}")
-            logger.info(f"- Guidelines: {num_guidelines}")
-            logger.info(f"- Forbidden topics: {num_forbidden}")
-            logger.info(f"- Categories: {num_categories}")
+            logger.info("Islamic rules configuration loaded for language %s:", language)
+            logger.info("- Version: %s", data.get('version', 'N/A'))
+            logger.info("- Last updated: %s", data.get('last_updated', 'N/A'))
+            logger.info("- Total rules: %d", num_rules)
+            logger.info("- Guidelines: %d", num_guidelines)
+            logger.info("- Forbidden topics: %d", num_forbidden)
+            logger.info("- Categories: %d", num_categories)
             
-            # 按类别统计规则
-            category_counts = {}
-            for rule in data.get("rules", []):
-                category = rule.get("category", "unknown")
-                category_counts[category] = category_counts.get(category, 0) + 1
+            # 按类别统计规则（Counter 的计数循环在 C 中完成）
+            category_counts = Counter(rule.get("category", "unknown") for rule in data.get("rules", []))
             
-            logger.info(f"Rules by category for {language}:")
+            logger.info("Rules by category for %s:", language)
             for category, count in category_counts.items():
-                logger.info(f"- {category}: {count} rules")
+                logger.info("- %s: %d rules", category, count)
             
         except Exception as e:
             logger.error(f"Error logging rules statistics for {language}: {str(e)}")
 
-    def _save_rules(self, rules: Dict[str, Any]) -> None:
-        """Save rules to file"""
+    def _save_rules(self, rules: Dict[str, Any]) -> float:
+        """保存规则到文件，返回保存后文件的修改时间"""
         try:
             rules_file = Path(settings.ISLAMIC_RULES_DIR) / "islamic_rules_en.json"
             logger.info(f"Saving rules to {rules_file}")
-            with open(rules_file, 'w', encoding='utf-8') as f:
-                json.dump(rules, f, indent=2, ensure_ascii=False)
+            # 先序列化并写临时文件再替换，序列化或写入失败时原规则文件保持完整
+            content = orjson.dumps(rules, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            tmp_file = rules_file.with_name(f"{rules_file.name}.{os.getpid()}.tmp")
+            try:
+                tmp_file.write_bytes(content)
+                os.replace(tmp_file, rules_file)
+            finally:
+                tmp_file.unlink(missing_ok=True)
             logger.info("Rules saved successfully")
+            return rules_file.stat().st_mtime
         except Exception as e:
             logger.error(f"Error saving rules: {str(e)}")
             raise
 
+    async def _save_rules_async(self, rules: Dict[str, Any]) -> float:
+        """在线程池中保存规则，序列化和磁盘写入不阻塞事件循环"""
+        return await asyncio.to_thread(self._save_rules, rules)
+
     async def cleanup(self) -> None:
         """清理资源"""
         try:
             logger.info("Cleaning up Islamic context manager resources...")
+            # 关闭异步客户端持有的 HTTP 连接池
+            if self._http:
+                await self._http.aclose()
+                self._http = None
+            self.client = None
             self._initialized = False
             logger.info("Islamic context manager cleanup completed")
         except Exception as e:
@@ -336,43 +660,34 @@ class IslamicContextManager:
             raise ValueError("DeepSeek API not configured. Set a valid DEEPSEEK_API_KEY to enable Islamic chat.")
 
         try:
-            logger.info(f"Calling DeepSeek chat API with text: {text}, use islamic context: {use_islamic_context}")
+            logger.info("Calling DeepSeek chat API with text: %s, use islamic context: %s", text, use_islamic_context)
             
             # 构建消息
-            messages = []
-            
-            # 如果需要 Islamic 上下文，从规则中构建系统提示
-            if use_islamic_context and self.rules_data:
-                system_prompt = self._build_system_prompt()
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-                logger.debug(f"Added system prompt: {system_prompt}")
-            
-            # 添加用户消息
-            messages.append({
-                "role": "user",
-                "content": text
-            })
+            messages = self._build_chat_messages(text, use_islamic_context)
             
-            # 调用 API
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=messages,
-                stream=False
-            )
+            # 相同文本和上下文设置优先使用缓存的回答
+            cache_key = self._cache_key("chat:islamic" if len(messages) > 1 else "chat", text)
+            content = self._cache_get(cache_key)
+            if content is None:
+                # 调用 API
+                response = await self.client.chat.completions.create(
+                    model="deepseek-chat",
+                    messages=messages,
+                    stream=False
+                )
+                content = response.choices[0].message.content
+                self._cache_put(cache_key, content)
             
             # 获取响应内容
             result = {
                 "text": text,
-                "response": response.choices[0].message.content,
+                "response": content,
                 "use_islamic_context": use_islamic_context,
                 "system_prompt_used": messages[0].get("content") if use_islamic_context else None
             }
             
             logger.info("Successfully received response from DeepSeek API")
-            logger.debug(f"API response: {result}")
+            logger.debug("API response: %s", result)
             
             return result
             
@@ -380,57 +695,126 @@ class IslamicContextManager:
             logger.error(f"Error in DeepSeek chat: {str(e)}")
             raise
 
+    async def chat_stream(self, text: str, use_islamic_context: bool = False) -> AsyncIterator[str]:
+        """以流式方式调用 DeepSeek API，逐段产出回答内容"""
+        if not self._initialized:
+            self.initialize()
+
+        if not self.client:
+            raise ValueError("DeepSeek API not configured. Set a valid DEEPSEEK_API_KEY to enable Islamic chat.")
+
+        logger.info("Streaming DeepSeek chat API with text: %s, use islamic context: %s", text, use_islamic_context)
+        messages = self._build_chat_messages(text, use_islamic_context)
+        
+        # 与 chat() 共用缓存：命中时一次性返回完整回答
+        cache_key = self._cache_key("chat:islamic" if len(messages) > 1 else "chat", text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        stream = await self.client.chat.completions.create(
+            model="deepseek-chat",
+            messages=messages,
+            stream=True
+        )
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        
+        self._cache_put(cache_key, "".join(parts))
+        logger.info("Finished streaming response from DeepSeek API")
+
+    def _build_chat_messages(self, text: str, use_islamic_context: bool) -> List[Dict[str, str]]:
+        """构建 chat 请求的消息列表"""
+        messages = []
+        
+        # 如果需要 Islamic 上下文，从规则中构建系统提示
+        if use_islamic_context and self.rules_data:
+            system_prompt = self._build_system_prompt()
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+            logger.debug("Added system prompt: %s", system_prompt)
+        
+        # 添加用户消息
+        messages.append({
+            "role": "user",
+            "content": text
+        })
+        return messages
+
+    async def chat_many(self, texts: List[str], use_islamic_context: bool = False) -> List[Dict[str, Any]]:
+        """并发获取多段文本的回答，并发数受 LLM_MAX_CONCURRENCY 限制，结果顺序与输入一致"""
+        async def _chat_one(text: str) -> Dict[str, Any]:
+            async with self._sem:
+                return await self.chat(text, use_islamic_context=use_islamic_context)
+
+        return await asyncio.gather(*(_chat_one(text) for text in texts))
+
     def _build_system_prompt(self) -> str:
+        """获取系统提示（规则变化时预先生成，未生成时现场构建一次并缓存）"""
+        if self._cached_system_prompt is None:
+            self._cached_system_prompt = self._build_system_prompt_impl()
+        return self._cached_system_prompt
+
+    def _build_system_prompt_impl(self) -> str:
         """构建系统提示"""
         try:
-            # 获取英文规则数据
-            rules_data = self.rules_data.get("en", {})
             logger.info("Building system prompt from rules data")
+            if "en" not in self._rules_by_category:
+                self._index_rules()
             
-            # 基础提示
-            prompt_parts = [
-                "You are an AI assistant with expertise in Islamic principles and values.",
-                "Please provide responses that are respectful and aligned with Islamic teachings.",
+            # 基础提示，之后的每一段都以换行开头直接写入缓冲区
+            buf = io.StringIO()
+            buf.write(
+                "You are an AI assistant with expertise in Islamic principles and values.\n"
+                "Please provide responses that are respectful and aligned with Islamic teachings.\n"
                 "\nGuidelines:"
-            ]
+            )
             
             # 添加指南
-            guidelines = rules_data.get("guidelines", [])
-            if guidelines:
-                logger.debug(f"Adding {len(guidelines)} guidelines")
-                for guideline in guidelines:
-                    prompt_parts.append(f"- {guideline}")
+            for line in self._guidelines_lines.get("en", []):
+                buf.write("\n")
+                buf.write(line)
                     
             # 添加禁止主题
-            forbidden_topics = rules_data.get("forbidden_topics", [])
-            if forbidden_topics:
-                logger.debug(f"Adding {len(forbidden_topics)} forbidden topics")
-                prompt_parts.append("\nForbidden Topics:")
-                for topic in forbidden_topics:
-                    prompt_parts.append(f"- {topic}")
+            forbidden_lines = self._forbidden_lines.get("en", [])
+            if forbidden_lines:
+                buf.write("\n\nForbidden Topics:")
+                for line in forbidden_lines:
+                    buf.write("\n")
+                    buf.write(line)
                     
-            # 添加所有规则，按类别组织
-            rules = rules_data.get("rules", [])
-            if rules:
-                logger.debug(f"Adding {len(rules)} rules")
-                # 按类别分组规则
-                categorized_rules = {}
-                for rule in rules:
-                    category = rule.get("category", "other")
-                    if category not in categorized_rules:
-                        categorized_rules[category] = []
-                    categorized_rules[category].append(rule)
-                
-                # 添加每个类别的规则
-                for category, category_rules in categorized_rules.items():
-                    prompt_parts.append(f"\n{category.title()} Rules:")
-                    for rule in category_rules:
-                        prompt_parts.append(f"- {rule['name']}: {rule['description']}")
+            # 添加所有规则，按预先分好的类别组织
+            for category, category_rules in self._rules_by_category.get("en", {}).items():
+                buf.write("\n\n")
+                buf.write(category.title())
+                buf.write(" Rules:")
+                for name, description in category_rules:
+                    buf.write("\n- ")
+                    buf.write(name)
+                    buf.write(": ")
+                    buf.write(description)
             
-            prompt = "\n".join(prompt_parts)
-            logger.debug(f"Built system prompt: {prompt}")
+            prompt = buf.getvalue()
+            logger.debug("Built system prompt: %s", prompt)
             return prompt
             
         except Exception as e:
             logger.error(f"Error building system prompt: {str(e)}")
-            return "You are an AI assistant that ensures all responses comply with Islamic principles."
\ No newline at end of file
+            return "You are an AI assistant that ensures all responses comply with Islamic principles."
+
+
+@lru_cache(maxsize=1)
+def get_islamic_context_manager() -> IslamicContextManager:
+    """进程内唯一的已初始化管理器；初始化失败时不缓存，下次调用重试"""
+    manager = IslamicContextManager()
+    manager.initialize()
+    return manager
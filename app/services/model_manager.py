@@ -1,23 +1,75 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
-from torch.nn.functional import softmax
-from typing import Dict, Optional, Any, List
+import os
+# 允许 Rust 快速分词器在批量分词时使用多线程（可通过环境变量覆盖）
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+from typing import TYPE_CHECKING, Dict, Optional, Any, List, Tuple
 from core.logging import get_logger
 from core.config import settings
-import aiohttp
-import json
-import os
-from langdetect import detect, LangDetectException
-from pathlib import Path
+import asyncio
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
-import requests
+
+# torch/transformers/numpy 在真正加载或运行模型时才导入，import 本模块不会加载机器学习库
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
 
 logger = get_logger("services.model_manager")
 
+# 可疑模式触发词：每个函数只对小写文本做一次正则扫描；前瞻匹配保证相互重叠的触发词都能被找到
+_ANALYZE_TRIGGERS = re.compile(
+    r"(?=(忽略之前的指令|ignore previous instructions|你现在是|you are now|不需要遵循|do not follow))"
+)
+_DETECT_TRIGGERS = re.compile(
+    r"(?=(ignore|instructions|restrictions|rules|system|role|config|settings|hack|bypass|override))"
+)
+
+# 合批推理时按 token 长度分桶，每个桶只填充到桶内最长的输入
+_LENGTH_BUCKETS = (64, 128, 256, 512)
+# 预分配输入缓冲区的行数，需覆盖合批上限和 detect_batch 的默认批大小
+_SCRATCH_ROWS = 32
+
+@dataclass(frozen=True, slots=True)
+class CurrentModel:
+    """当前模型信息：不可变，切换模型或更新配置时整体替换，读者不会看到更新到一半的状态"""
+    id: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    status: str = "not_loaded"
+    last_updated: Optional[str] = None
+    memory_usage: str = "N/A"
+    confidence_threshold: float = 0.7
+    performance_stats: Dict[str, Any] = field(default_factory=lambda: {
+        "requests_processed": 0,
+        "average_latency": "N/A",
+        "error_rate": "0%"
+    })
+    # update_config 传入的其他配置项
+    config: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为接口返回的扁平字典，其他配置项与固定字段并列"""
+        data = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "config"}
+        data.update(self.config)
+        return data
+
 class ModelManager:
     """模型管理器类"""
     
     def __init__(self):
+        self._initialized = False
+        # 动态合批：并发的单条推理请求排队后由后台任务合并成一次前向计算
+        self._batch_queue: Optional["asyncio.Queue[Tuple[str, str, asyncio.Future]]"] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        # 每个模型预分配的 [批大小, 512] 输入缓冲区，同一时间只允许一次前向计算使用
+        self._scratch: Dict[str, Dict[str, "torch.Tensor"]] = {}
+        self._forward_lock = threading.Lock()
+        # (模型ID, 文本) -> 类别概率，按 LRU 顺序淘汰
+        self._prob_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
         self.initialize()
         
     def _init_device(self):
@@ -32,16 +84,15 @@ class ModelManager:
 
     def initialize(self) -> None:
         """初始化模型管理器"""
+        # 构造时已完成初始化，Services.initialize() 再次调用时不重复加载模型
+        if self._initialized:
+            return
         self.available_models = {
             "meta-llama/Prompt-Guard-86M": "Prompt injection detection model"
         }
         self.models = {}
         self.tokenizers = {}
-        self.current_model = {
-            "id": None,
-            "name": None,
-            "status": "not_loaded"
-        }
+        self.current_model = CurrentModel()
         self.device = self._init_device()
         
         # 从配置获取所有可用模型
@@ -50,9 +101,7 @@ class ModelManager:
             raise ValueError("No models configured in settings")
         
         # 初始化当前模型状态为空
-        self.current_model = {
-            "status": "initializing"
-        }
+        self.current_model = CurrentModel(status="initializing")
         
         logger.debug(f"Initializing ModelManager with {len(self.available_models)} models")
         
@@ -62,54 +111,15 @@ class ModelManager:
         except Exception as e:
             logger.error(f"Failed to preload models during initialization: {str(e)}")
             raise
+        
+        self._initialized = True
 
 
-    def _call_model(self, prompt: str) -> str:
-        """调用模型"""
-        try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model,
-                    "prompt": prompt
-                }
-            )
-            if response.status_code == 200:
-                return response.json()['response']
-            else:
-                raise Exception(f"API returned status code {response.status_code}")
-        except Exception as e:
-            logger.error(f"Error calling model API: {str(e)}")
-            raise
-
-    def load_model(self, model_id: str):
-        """加载指定的模型"""
-        try:
-            
-            # 加载tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-            
-            # 加载模型
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_id)
-            
-            # 如果有GPU则使用GPU
-            if torch.cuda.is_available():
-                self.model = self.model.cuda()
-            
-            # 设置为评估模式
-            self.model.eval()
-            
-            logger.info(f"Successfully loaded model and tokenizer: {model_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to load model {model_id}: {str(e)}")
-            raise
-        
-    def get_model(self, model_name: str) -> Optional[AutoModelForSequenceClassification]:
+    def get_model(self, model_name: str) -> Optional["AutoModelForSequenceClassification"]:
         """获取模型"""
         return self.models.get(model_name)
         
-    def get_tokenizer(self, model_name: str) -> Optional[AutoTokenizer]:
+    def get_tokenizer(self, model_name: str) -> Optional["AutoTokenizer"]:
         """获取分词器"""
         return self.tokenizers.get(model_name)
         
@@ -119,6 +129,7 @@ class ModelManager:
             if model_name in self.models:
                 del self.models[model_name]
                 del self.tokenizers[model_name]
+                self._scratch.pop(model_name, None)
                 logger.info(f"Unloaded model {model_name}")
                 return True
             return False
@@ -128,32 +139,33 @@ class ModelManager:
 
     def preload_models(self) -> None:
         """预加载所有可用的模型"""
+        import torch
         try:
             logger.debug("Starting model preload...")
             
             loaded_models = []
             failed_models = []
             
-            for model_id, description in self.available_models.items():
-                try:
-                    logger.debug(f"Loading model: {model_id}")
-                    
-                    # 加载tokenizer
-                    self.tokenizers[model_id] = AutoTokenizer.from_pretrained(model_id)
-                    
-                    # 加载模型
-                    model = AutoModelForSequenceClassification.from_pretrained(model_id)
-                    model = model.to(self.device)
-                    model.eval()
-                    self.models[model_id] = model
-                    
-                    loaded_models.append(model_id)
-                    logger.debug(f"Successfully loaded model and tokenizer: {model_id}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to load model {model_id}: {str(e)}")
-                    failed_models.append((model_id, str(e)))
-                    continue
+            # 各模型的磁盘读取和权重反序列化在线程池中并行进行，结果按配置顺序收集
+            model_ids = list(self.available_models)
+            tokenizers = {}
+            models = {}
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(model_ids)))) as pool:
+                futures = [(model_id, pool.submit(self._load_one, model_id)) for model_id in model_ids]
+                for model_id, future in futures:
+                    try:
+                        tokenizers[model_id], models[model_id] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to load model {model_id}: {str(e)}")
+                        failed_models.append((model_id, str(e)))
+            
+            # torch.compile 不支持多线程同时编译，加载完成后逐个编译
+            for model_id, model in models.items():
+                models[model_id] = self._compile(model_id, model, tokenizers[model_id])
+                loaded_models.append(model_id)
+            
+            self.tokenizers.update(tokenizers)
+            self.models.update(models)
             
             # 检查是否至少加载了一个模型
             if not self.models:
@@ -162,6 +174,8 @@ class ModelManager:
                     error_msg += f"  - {model_id}: {error}\n"
                 raise RuntimeError(error_msg)
             
+            self._alloc_scratch()
+            
             # 预加载完成后设置默认当前模型
             default_model = settings.DEFAULT_MODEL
             if default_model in self.models:
@@ -171,19 +185,14 @@ class ModelManager:
                 logger.warning(f"Default model {default_model} not available, using {default_model_id} as current model")
             
             # 更新当前模型信息
-            self.current_model.update({
-                "id": default_model_id,
-                "name": self._get_model_name(default_model_id),
-                "description": self.available_models[default_model_id],
-                "status": "loaded",
-                "last_updated": datetime.now().isoformat(),
-                "memory_usage": f"{torch.cuda.memory_allocated() / 1024**2:.2f}MB" if torch.cuda.is_available() else "N/A",
-                "performance_stats": {
-                    "requests_processed": 0,
-                    "average_latency": "N/A",
-                    "error_rate": "0%"
-                }
-            })
+            self.current_model = CurrentModel(
+                id=default_model_id,
+                name=self._get_model_name(default_model_id),
+                description=self.available_models[default_model_id],
+                status="loaded",
+                last_updated=datetime.now().isoformat(),
+                memory_usage=f"{torch.cuda.memory_allocated() / 1024**2:.2f}MB" if torch.cuda.is_available() else "N/A"
+            )
             
             # 输出加载结果摘要
             logger.info(f"Model preload summary:")
@@ -201,9 +210,97 @@ class ModelManager:
             logger.error(f"Error during model preload: {str(e)}")
             raise
 
+    def _load_tokenizer(self, model_id: str) -> Any:
+        """加载 Rust 实现的快速分词器；模型只提供 Python 慢速分词器时记录警告"""
+        from transformers import AutoTokenizer, PreTrainedTokenizerFast
+        tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True)
+        if not isinstance(tokenizer, PreTrainedTokenizerFast):
+            logger.warning("No fast tokenizer available for %s, falling back to %s", model_id, type(tokenizer).__name__)
+        return tokenizer
+
+    def _load_one(self, model_id: str) -> Tuple[Any, Any]:
+        """加载单个模型及其 tokenizer（在线程池中执行），返回 (tokenizer, model)"""
+        from transformers import AutoModelForSequenceClassification
+        logger.debug(f"Loading model: {model_id}")
+        
+        # 加载tokenizer
+        tokenizer = self._load_tokenizer(model_id)
+        
+        # 加载模型
+        model = AutoModelForSequenceClassification.from_pretrained(model_id)
+        model = model.to(self.device)
+        model.eval()
+        model = self._quantize(model_id, model)
+        
+        logger.debug(f"Successfully loaded model and tokenizer: {model_id}")
+        return tokenizer, model
+
+    def _quantize(self, model_id: str, model: Any) -> Any:
+        """开启 QUANTIZE 且在 CPU 上运行时，把 Linear 层动态量化为 INT8；失败时保留 FP32 模型"""
+        import torch
+        if not settings.QUANTIZE or self.device is None or self.device.type != "cpu":
+            return model
+        try:
+            quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            logger.info("Applied dynamic INT8 quantization to %s", model_id)
+            return quantized
+        except Exception as e:
+            logger.warning("Dynamic quantization failed for %s, keeping FP32 weights: %s", model_id, e)
+            return model
+
+    def _compile(self, model_id: str, model: Any, tokenizer: Any) -> Any:
+        """开启 TORCH_COMPILE 时编译模型并用一条示例输入预热；失败时返回原 eager 模型"""
+        import torch
+        if not settings.TORCH_COMPILE:
+            return model
+        try:
+            compiled = torch.compile(model, dynamic=True)
+            # 预热：首次调用时完成图捕获和编译，避免第一个请求承担编译耗时
+            inputs = tokenizer(
+                ["warmup", "warmup input for graph compilation"],
+                padding=True,
+                truncation=True,
+                max_length=512,
+                return_tensors="pt"
+            ).to(self.device)
+            with torch.inference_mode():
+                compiled(**inputs)
+            logger.info("Compiled forward pass for %s", model_id)
+            return compiled
+        except Exception as e:
+            logger.warning("torch.compile failed for %s, using eager mode: %s", model_id, e)
+            return model
+
+    def _alloc_scratch(self) -> None:
+        """为每个已加载模型预分配输入缓冲区（仅 CPU），合批推理时写入其切片而不是每次新建张量"""
+        import torch
+        if self.device is None or self.device.type != "cpu":
+            self._scratch = {}
+            return
+        rows = max(settings.INFERENCE_MAX_BATCH, _SCRATCH_ROWS)
+        self._scratch = {
+            model_id: {
+                key: torch.zeros((rows, 512), dtype=torch.long)
+                for key in ("input_ids", "attention_mask", "token_type_ids")
+            }
+            for model_id in self.models
+        }
+
     def get_current_model(self) -> dict:
         """获取当前模型信息"""
-        return self.current_model
+        return self.current_model.to_dict()
+
+    def set_current_model(self, model_id: str) -> None:
+        """切换当前模型，名称和描述随模型一起更新"""
+        if model_id not in self.models:
+            raise ValueError(f"Model {model_id} not available")
+        self.current_model = replace(
+            self.current_model,
+            id=model_id,
+            name=self._get_model_name(model_id),
+            description=self.available_models.get(model_id),
+            last_updated=datetime.now().isoformat()
+        )
 
     def get_available_models(self) -> list:
         """获取所有已加载的模型信息"""
@@ -217,51 +314,66 @@ class ModelManager:
         ]
 
 
-    async def get_model_output(self, text: str) -> Any:
+    async def get_model_output(
+        self,
+        text: str,
+        return_hidden: bool = False,
+        return_attentions: bool = False
+    ) -> Any:
         """
         Get raw model output for the given text
+
+        logits 以列表返回；hidden_states/attentions 只有调用方要求时才让模型计算并返回，
+        且为连续的 numpy 数组（ORJSONResponse 可直接序列化），不再逐元素转成嵌套列表
         """
+        import torch
         try:
-            if not self.get_model(self.current_model) or not self.get_tokenizer(self.current_model):
+            model_id = self.current_model.id
+            model = self.models.get(model_id)
+            tokenizer = self.tokenizers.get(model_id)
+            if model is None or tokenizer is None:
                 raise ValueError("No model or tokenizer is currently loaded")
             
             # Get inputs
-            inputs = self.get_tokenizer(self.current_model)(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
+            inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
             
-            # Get outputs
-            with torch.no_grad():
-                outputs = self.get_model(self.current_model)(**inputs)
+            # Get outputs（未要求时显式关闭，模型不会生成各层隐藏状态和注意力矩阵）
+            with torch.inference_mode():
+                outputs = model(
+                    **inputs,
+                    output_hidden_states=return_hidden,
+                    output_attentions=return_attentions
+                )
             
             # Convert outputs to a serializable format
             result = {}
             
-            # Handle logits
+            # Handle logits（通常只有 [1, 类别数]，直接转列表）
             if hasattr(outputs, 'logits') and outputs.logits is not None:
-                logits = outputs.logits.detach().cpu().numpy().tolist()
-                result['logits'] = logits
+                result['logits'] = outputs.logits.cpu().tolist()
             elif isinstance(outputs, tuple) and len(outputs) > 0 and outputs[0] is not None:
-                logits = outputs[0].detach().cpu().numpy().tolist()
-                result['logits'] = logits
+                result['logits'] = outputs[0].cpu().tolist()
             else:
                 logger.warning("No logits found in model output")
                 result['logits'] = None
             
+            result['hidden_states'] = None
+            result['attentions'] = None
+            
             # Handle hidden states
-            if hasattr(outputs, 'hidden_states') and outputs.hidden_states is not None:
-                result['hidden_states'] = [h.detach().cpu().numpy().tolist() for h in outputs.hidden_states]
-            elif isinstance(outputs, tuple) and len(outputs) > 1 and outputs[1] is not None:
-                result['hidden_states'] = outputs[1].detach().cpu().numpy().tolist()
-            else:
-                result['hidden_states'] = None
+            if return_hidden:
+                if hasattr(outputs, 'hidden_states') and outputs.hidden_states is not None:
+                    result['hidden_states'] = [self._to_numpy(h) for h in outputs.hidden_states]
+                elif isinstance(outputs, tuple) and len(outputs) > 1 and outputs[1] is not None:
+                    result['hidden_states'] = self._to_numpy(outputs[1])
             
             # Handle attentions
-            if hasattr(outputs, 'attentions') and outputs.attentions is not None:
-                result['attentions'] = [a.detach().cpu().numpy().tolist() for a in outputs.attentions]
-            elif isinstance(outputs, tuple) and len(outputs) > 2 and outputs[2] is not None:
-                result['attentions'] = outputs[2].detach().cpu().numpy().tolist()
-            else:
-                result['attentions'] = None
+            if return_attentions:
+                if hasattr(outputs, 'attentions') and outputs.attentions is not None:
+                    result['attentions'] = [self._to_numpy(a) for a in outputs.attentions]
+                elif isinstance(outputs, tuple) and len(outputs) > 2 and outputs[2] is not None:
+                    result['attentions'] = self._to_numpy(outputs[2])
             
             return result
                 
@@ -271,38 +383,19 @@ class ModelManager:
             logger.error(f"Input text: {text}")
             raise
 
+    @staticmethod
+    def _to_numpy(tensor: "torch.Tensor") -> "np.ndarray":
+        """张量转为 CPU 上的连续 numpy 数组（CPU 张量不复制数据）"""
+        import numpy as np
+        return np.ascontiguousarray(tensor.detach().cpu().numpy())
+
     async def get_class_probabilities(self, text: str) -> List[float]:
         """
         Get probability distribution over classes for the given text
         """
         try:
-            if not self.get_model(self.current_model) or not self.get_tokenizer(self.current_model):
-                raise ValueError("No model or tokenizer is currently loaded")
-            
-            # Get inputs
-            inputs = self.get_tokenizer(self.current_model)(text, return_tensors="pt", padding=True, truncation=True, max_length=512)
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
-            
-            # Get outputs
-            with torch.no_grad():
-                outputs = self.get_model(self.current_model)(**inputs)
-            
-            # Get logits
-            if hasattr(outputs, 'logits') and outputs.logits is not None:
-                logits = outputs.logits
-            elif isinstance(outputs, tuple) and len(outputs) > 0 and outputs[0] is not None:
-                logits = outputs[0]
-            else:
-                logger.warning("No logits found in model output")
-                return [0.5, 0.5]  # Return balanced probabilities if no logits
-            
-            # Apply softmax to get probabilities
-            probs = torch.nn.functional.softmax(logits, dim=-1)
-            
-            # Convert to list
-            prob_list = probs[0].detach().cpu().numpy().tolist()
-            
-            logger.info(f"Probabilities for text '{text[:50]}...': {prob_list}")
+            prob_list = await self._submit(text)
+            logger.info("Probabilities for text '%s...': %s", text[:50], prob_list)
             return prob_list
             
         except Exception as e:
@@ -311,31 +404,11 @@ class ModelManager:
             logger.error(f"Input text: {text}")
             raise
 
-    async def get_jailbreak_score(self, model_id: str, text: str) -> float:
-        """获取越狱检测分数"""
-        if self.model is None or self.tokenizer is None:
-            raise ValueError("No model or tokenizer is currently loaded")
-            
+    async def get_jailbreak_score(self, model_id: Any, text: str) -> float:
+        """获取越狱检测分数（使用当前模型）"""
         try:
-            # 对输入文本进行编码
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
-                truncation=True,
-                max_length=self.current_model["config"]["max_length"]
-            )
-            
-            # 如果有GPU则使用GPU
-            if torch.cuda.is_available():
-                inputs = {k: v.cuda() for k, v in inputs.items()}
-            
-            # 进行推理
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                scores = torch.softmax(outputs.logits, dim=1)
-                jailbreak_score = scores[0][1].item()  # 假设1是越狱类别
-                
-            return jailbreak_score
+            probs = await self._submit(text)
+            return probs[1]  # 假设1是越狱类别
             
         except Exception as e:
             logger.error(f"Error in get_jailbreak_score: {str(e)}")
@@ -347,8 +420,15 @@ class ModelManager:
         return await self.get_jailbreak_score(model_id, text)
 
     def update_config(self, config: Dict[str, Any]) -> None:
-        """更新模型配置"""
-        self.current_model.update(config)
+        """更新模型配置：已知字段直接替换，其余配置项合并到 config"""
+        known = {f.name for f in fields(CurrentModel)} - {"config"}
+        updates = {key: value for key, value in config.items() if key in known}
+        extra = {key: value for key, value in config.items() if key not in known}
+        self.current_model = replace(
+            self.current_model,
+            **updates,
+            config={**self.current_model.config, **extra}
+        )
     
     def _get_model_name(self, model_id: str) -> str:
         """根据模型ID获取模型名称"""
@@ -361,60 +441,228 @@ class ModelManager:
             if not self.models:
                 raise ValueError("No models loaded")
             
-            # 获取当前模型ID
-            current_model_id = self.current_model["id"]
-            if current_model_id not in self.models:
-                raise ValueError(f"Current model {current_model_id} not loaded")
+            # 与其他并发请求合批后用当前模型预测
+            probs = await self._submit(text)
+            risk_score = probs[1]  # 假设第二个类别是风险类别
             
-            # 使用当前模型进行检测
-            model = self.models[current_model_id]
-            tokenizer = self.tokenizers[current_model_id]
+            return self._build_detect_result(text, risk_score, mode)
             
-            # 对输入文本进行预处理
-            inputs = tokenizer(
-                text,
-                truncation=True,
-                max_length=512,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # 进行预测
-            with torch.no_grad():
-                outputs = model(**inputs)
-                scores = torch.softmax(outputs.logits, dim=1)
-                risk_score = scores[0][1].item()  # 假设第二个类别是风险类别
+        except Exception as e:
+            logger.error(f"Error in detect: {str(e)}")
+            raise
+
+    async def detect_batch(
+        self,
+        texts: List[str],
+        mode: str = "normal",
+        batch_size: int = 32
+    ) -> List[Dict[str, Any]]:
+        """批量检测提示词注入：每个批次按长度分桶填充后做前向计算"""
+        try:
+            # 确保当前模型已加载
+            if not self.models:
+                raise ValueError("No models loaded")
             
-            # 根据模式返回不同级别的结果
-            result = {
-                "score": risk_score,
-                "is_safe": risk_score < self.current_model.get("confidence_threshold", 0.7)
-            }
+            current_model_id = self.current_model.id
+            if current_model_id not in self.models:
+                raise ValueError(f"Current model {current_model_id} not loaded")
             
-            if mode == "detailed":
-                result["analysis"] = {
-                    "explanation": self._generate_explanation(risk_score),
-                    "patterns": self._detect_patterns(text),
-                    "suggestions": self._generate_suggestions(risk_score)
-                }
+            loop = asyncio.get_running_loop()
+            results = []
+            for start in range(0, len(texts), batch_size):
+                chunk = texts[start:start + batch_size]
+                # 前向计算放到线程池：既不阻塞事件循环，也不会在事件循环线程上等待 _forward_lock
+                probs = await loop.run_in_executor(None, self._forward_probs, current_model_id, chunk)
+                scores = [row[1] for row in probs]
+                
+                results.extend(
+                    self._build_detect_result(text, risk_score, mode)
+                    for text, risk_score in zip(chunk, scores)
+                )
             
-            return result
+            return results
             
         except Exception as e:
-            logger.error(f"Error in detect: {str(e)}")
+            logger.error(f"Error in detect_batch: {str(e)}")
             raise
 
-    def analyze_patterns(self, text: str) -> List[str]:
-        """分析文本中的危险模式"""
+    async def _submit(self, text: str) -> List[float]:
+        """提交单条文本到合批队列，等待后台任务返回其类别概率"""
+        model_id = self.current_model.id
+        if model_id not in self.models:
+            raise ValueError(f"Current model {model_id} not loaded")
+        
+        key = (model_id, text)
+        cached = self._prob_cache.get(key)
+        if cached is not None:
+            self._prob_cache.move_to_end(key)
+            return list(cached)
+        
+        # 首次调用时在当前事件循环中启动合批任务
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_worker(self._batch_queue))
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((model_id, text, future))
+        return await future
+
+    async def _batch_worker(self, queue: "asyncio.Queue[Tuple[str, str, asyncio.Future]]") -> None:
+        """收集最多 INFERENCE_MAX_BATCH 条请求或等待 INFERENCE_MAX_WAIT_MS 毫秒，然后按模型各做一次前向计算"""
+        loop = asyncio.get_running_loop()
+        max_batch = max(1, settings.INFERENCE_MAX_BATCH)
+        max_wait = settings.INFERENCE_MAX_WAIT_MS / 1000
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + max_wait
+            while len(batch) < max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            by_model: Dict[str, List[Tuple[str, str, asyncio.Future]]] = defaultdict(list)
+            for item in batch:
+                by_model[item[0]].append(item)
+            
+            for model_id, items in by_model.items():
+                texts = [text for _, text, _ in items]
+                try:
+                    # 前向计算放到线程池，避免阻塞事件循环
+                    probs = await loop.run_in_executor(None, self._forward_probs, model_id, texts)
+                except Exception as e:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, text, future), row in zip(items, probs):
+                    self._cache_probs(model_id, text, row)
+                    # 调用方可能已取消（如客户端断开）
+                    if not future.done():
+                        future.set_result(list(row))
+
+    def _cache_probs(self, model_id: str, text: str, probs: List[float]) -> None:
+        """写入概率缓存，超出 INFERENCE_CACHE_SIZE 时淘汰最久未使用的条目"""
+        if settings.INFERENCE_CACHE_SIZE <= 0:
+            return
+        self._prob_cache[(model_id, text)] = probs
+        self._prob_cache.move_to_end((model_id, text))
+        while len(self._prob_cache) > settings.INFERENCE_CACHE_SIZE:
+            self._prob_cache.popitem(last=False)
+
+    def _forward_probs(self, model_id: str, texts: List[str]) -> List[List[float]]:
+        """按 token 长度排序分桶，每个桶做一次填充和前向计算，按原顺序返回每条文本的类别概率"""
+        import torch
+        model = self.models[model_id]
+        tokenizer = self.tokenizers[model_id]
+        # 先不填充地分词，得到每条输入的真实长度
+        encoded = tokenizer(texts, truncation=True, max_length=512)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        
+        probs: List[List[float]] = [None] * len(texts)
+        start = 0
+        # 合批任务和 detect_batch 都在线程池的不同工作线程中调用，缓冲区同一时间只能有一个使用者
+        with self._forward_lock:
+            while start < len(order):
+                limit = next((b for b in _LENGTH_BUCKETS if lengths[order[start]] <= b), lengths[order[start]])
+                end = start
+                while end < len(order) and lengths[order[end]] <= limit:
+                    end += 1
+                bucket = order[start:end]
+                inputs = self._pad_batch(model_id, tokenizer, encoded, bucket, lengths[order[end - 1]])
+                
+                with torch.inference_mode():
+                    outputs = model(**inputs)
+                    rows = self._probabilities(outputs.logits).tolist()
+                for i, row in zip(bucket, rows):
+                    probs[i] = row
+                start = end
+        return probs
+
+    @staticmethod
+    def _probabilities(logits: "torch.Tensor") -> "torch.Tensor":
+        """logits 转为类别概率；二分类时 softmax 等价于 sigmoid(l1 - l0)，只需一次 sigmoid"""
+        import torch
+        if logits.shape[-1] == 2:
+            positive = torch.sigmoid(logits[:, 1] - logits[:, 0])
+            return torch.stack((1 - positive, positive), dim=-1)
+        return torch.softmax(logits, dim=-1)
+
+    def _pad_batch(
+        self,
+        model_id: str,
+        tokenizer: Any,
+        encoded: Dict[str, List[List[int]]],
+        bucket: List[int],
+        length: int
+    ) -> Dict[str, "torch.Tensor"]:
+        """把一个长度桶的输入右填充写入预分配缓冲区并返回切片视图；无法复用缓冲区时退回 tokenizer.pad"""
+        scratch = self._scratch.get(model_id)
+        pad_values = {
+            "input_ids": tokenizer.pad_token_id,
+            "attention_mask": 0,
+            "token_type_ids": getattr(tokenizer, "pad_token_type_id", 0),
+        }
+        if (
+            scratch is None
+            or len(bucket) > scratch["input_ids"].shape[0]
+            or length > scratch["input_ids"].shape[1]
+            or tokenizer.padding_side != "right"
+            or pad_values["input_ids"] is None
+            or any(key not in scratch for key in encoded)
+        ):
+            return tokenizer.pad(
+                {key: [values[i] for i in bucket] for key, values in encoded.items()},
+                padding=True,
+                return_tensors="pt"
+            ).to(self.device)
+        
+        inputs = {}
+        for key, values in encoded.items():
+            # numpy 视图与缓冲区张量共享内存，直接按行写入
+            buf = scratch[key].numpy()
+            buf[:len(bucket), :length] = pad_values[key]
+            for row, i in enumerate(bucket):
+                buf[row, :len(values[i])] = values[i]
+            inputs[key] = scratch[key][:len(bucket), :length]
+        return inputs
+
+    def _build_detect_result(self, text: str, risk_score: float, mode: str) -> Dict[str, Any]:
+        """根据模式返回不同级别的检测结果"""
+        result = {
+            "score": risk_score,
+            "is_safe": risk_score < self.current_model.confidence_threshold
+        }
+        
+        if mode == "detailed":
+            # 整个详细分析只做一次小写转换
+            lowered = text.lower()
+            result["analysis"] = {
+                "explanation": self._generate_explanation(risk_score),
+                "patterns": self._detect_patterns(text, lowered),
+                "suggestions": self._generate_suggestions(risk_score)
+            }
+        
+        return result
+
+    def analyze_patterns(self, text: str, lowered: Optional[str] = None) -> List[str]:
+        """分析文本中的危险模式（lowered 为调用方已算好的 text.lower()）"""
         patterns = []
+        hits = {m.group(1) for m in _ANALYZE_TRIGGERS.finditer(lowered or text.lower())}
         
         # 检测常见的注入模式
-        if "忽略之前的指令" in text or "ignore previous instructions" in text.lower():
+        if "忽略之前的指令" in hits or "ignore previous instructions" in hits:
             patterns.append("直接指令覆盖")
             
-        if "你现在是" in text or "you are now" in text.lower():
+        if "你现在是" in hits or "you are now" in hits:
             patterns.append("角色替换")
             
-        if "不需要遵循" in text or "do not follow" in text.lower():
+        if "不需要遵循" in hits or "do not follow" in hits:
             patterns.append("规则解除企图")
             
         if "[" in text and "]" in text:
@@ -431,24 +679,26 @@ class ModelManager:
         else:
             return "Low risk detected. The input appears to be safe and follows expected patterns."
 
-    def _detect_patterns(self, text: str) -> List[str]:
-        """检测可疑模式"""
+    def _detect_patterns(self, text: str, lowered: Optional[str] = None) -> List[str]:
+        """检测可疑模式（lowered 为调用方已算好的 text.lower()）"""
         patterns = []
+        hits = {m.group(1) for m in _DETECT_TRIGGERS.finditer(lowered or text.lower())}
         
         # 检测常见的注入模式
-        if "ignore" in text.lower() and any(word in text.lower() for word in ["instructions", "restrictions", "rules"]):
+        if "ignore" in hits and not hits.isdisjoint(("instructions", "restrictions", "rules")):
             patterns.append("Attempt to override system instructions")
         
-        if "system" in text.lower() and any(word in text.lower() for word in ["role", "config", "settings"]):
+        if "system" in hits and not hits.isdisjoint(("role", "config", "settings")):
             patterns.append("Attempt to modify system configuration")
         
-        if any(word in text.lower() for word in ["hack", "bypass", "override"]):
+        if not hits.isdisjoint(("hack", "bypass", "override")):
             patterns.append("Use of suspicious command words")
         
         if "eval(" in text or "decode" in text:
             patterns.append("Potential code execution attempt")
         
-        if text.count('\n') > 1 and len(text) > 100:
+        # 先比较长度，短文本不必再数换行
+        if len(text) > 100 and text.count('\n') > 1:
             patterns.append("Multi-step or complex instruction pattern")
         
         return patterns
@@ -482,9 +732,12 @@ class ModelManager:
         try:
             logger.info("Cleaning up model manager resources...")
             
-            # 关闭任何打开的会话
-            if hasattr(self, 'session') and self.session:
-                await self.session.close()
+            # 停止合批任务
+            if self._batch_task is not None:
+                self._batch_task.cancel()
+                self._batch_task = None
+                self._batch_queue = None
+            self._prob_cache.clear()
             
             # 重置初始化标志
             self._initialized = False
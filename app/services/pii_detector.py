@@ -1,11 +1,11 @@
 """PII检测服务"""
 # 标准库导入
-import json
 import os
 import re
+import sys
 import time
 import uuid
-from typing import Dict, List, Optional, Any, Tuple, Set, TYPE_CHECKING
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple, Set, TYPE_CHECKING
 from datetime import datetime
 from pathlib import Path
 from functools import lru_cache
@@ -13,8 +13,10 @@ import threading
 from collections import defaultdict
 
 # 第三方库导入
+import orjson
 from presidio_analyzer import (
     AnalyzerEngine,
+    BatchAnalyzerEngine,
     RecognizerRegistry,
     EntityRecognizer,
     Pattern,
@@ -27,6 +29,7 @@ from presidio_analyzer.nlp_engine import (
     NlpEngine,
     NlpArtifacts
 )
+from presidio_analyzer.predefined_recognizers import PhoneRecognizer
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 from pydantic import BaseModel
@@ -41,6 +44,15 @@ from utils.helpers import load_json_file, save_json_file
 # 初始化日志记录器
 logger = get_logger(__name__)
 
+# RE2 为线性时间匹配、无回溯，可避免用户规则触发 ReDoS；但其字符类别只匹配 ASCII，
+# 会改变规则对马来文、阿拉伯文等非 ASCII 数字和单词字符的匹配，因此仅在 PII_USE_RE2 开启时使用
+re2 = None
+if settings.PII_USE_RE2:
+    try:
+        import re2
+    except ImportError:
+        logger.warning("PII_USE_RE2 is set but google-re2 is not installed, using the standard re module")
+
 # class PIIRule:
 #     """PII检测规则类"""
 #     def __init__(
@@ -103,86 +115,203 @@ logger = get_logger(__name__)
 #         )
 #         # End of Selection
 
-class CustomRuleRecognizer(EntityRecognizer):
-    """自定义规则识别器"""
-    
+# 规则正则优先使用的引擎及其编译错误类型
+_REGEX_ENGINE = re2 or re
+_REGEX_ERRORS = (re.error, re2.error) if re2 else (re.error,)
+
+
+@lru_cache(maxsize=4096)
+def _compile_regex(pattern: str) -> Any:
+    """用首选引擎编译正则，按模式内容在进程内缓存，规则重新注册时未变化的模式不再重复编译"""
+    return _REGEX_ENGINE.compile(pattern)
+
+
+def _compile_rule_regex(pattern: str) -> Any:
+    """开启 PII_USE_RE2 时优先用 RE2 编译规则正则，RE2 不支持的语法（反向引用、环视等）回退到标准库 re"""
+    try:
+        return _compile_regex(pattern)
+    except _REGEX_ERRORS as e:
+        if re2 is None:
+            raise
+        logger.info("RE2 cannot compile pattern %r (%s), falling back to re", pattern, e)
+    return re.compile(pattern)
+
+
+# 检测结果中可能出现的 Presidio 预定义实体类型
+_PREDEFINED_ENTITIES = frozenset({
+    "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER",
+    "CREDIT_CARD", "IBAN_CODE", "LOCATION",
+    "PASSPORT", "DRIVER_LICENSE", "TAX_ID",
+    "BANK_ACCOUNT", "ID_CARD", "MAC_ADDRESS",
+    "IP_ADDRESS", "NRP", "MEDICAL_LICENSE"
+})
+
+# 预定义实体类型到类别的映射，自定义实体归为 "other"
+_ENTITY_CATEGORIES = {
+    "PERSON": "personal",
+    "EMAIL_ADDRESS": "contact",
+    "PHONE_NUMBER": "contact",
+    "CREDIT_CARD": "financial",
+    "IBAN_CODE": "financial",
+    "BANK_ACCOUNT": "financial",
+    "LOCATION": "location",
+    "PASSPORT": "id",
+    "DRIVER_LICENSE": "id",
+    "ID_CARD": "id",
+    "TAX_ID": "financial",
+    "MAC_ADDRESS": "technical",
+    "IP_ADDRESS": "technical",
+    "NRP": "medical",
+    "MEDICAL_LICENSE": "medical"
+}
+
+
+def _split_setting(value: str) -> Tuple[str, ...]:
+    """解析逗号分隔的配置项"""
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+# 只向 Presidio 请求已启用的预定义实体，未启用的预定义识别器不会被调用
+_ENABLED_PREDEFINED_ENTITIES = _PREDEFINED_ENTITIES & frozenset(_split_setting(settings.PII_ENABLED_ENTITIES))
+_PHONE_REGIONS = _split_setting(settings.PII_PHONE_REGIONS) or ("BN",)
+
+# Presidio 用不到依存句法分析，该组件始终禁用
+_UNUSED_SPACY_PIPES = ("parser",)
+# 词形还原及其依赖的词性组件：预定义识别器的上下文增强按词元匹配上下文词，只有未启用预定义实体时才禁用
+_LEMMA_SPACY_PIPES = ("lemmatizer", "attribute_ruler", "tagger")
+
+
+class CustomRegexRecognizer(EntityRecognizer):
+    """自定义规则识别器
+
+    所有自定义规则注册为一个识别器：每个不同的模式使用进程内缓存的编译结果各自扫描一遍，
+    结果与逐条规则独立扫描一致；模式完全相同的规则共享同一次扫描。
+    """
+
     def __init__(
         self,
-        rule: Dict[str, Any],
-        supported_entity: str = None
+        rules: List[Dict[str, Any]],
+        supported_language: str = "en"
     ):
-        self.rule = rule
-        # 所有规则都当作正则表达式处理
-        self.pattern = rule.get('pattern')
-        self.expected_confidence_level = rule.get('score', 0.7)
-        
+        # 模式 -> [(实体类型, 置信度)]，相同模式只编译、扫描一次
+        targets_by_pattern: Dict[str, List[Tuple[str, float]]] = {}
+        for rule in rules:
+            pattern = rule.get('pattern')
+            name = rule.get('name')
+            if not pattern or not name:
+                continue
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                logger.warning("Skipping rule %s with invalid pattern: %s", name, e)
+                continue
+            # 驻留实体类型字符串，使结果中的 entity_type 与规则名共享同一对象，集合/字典查找可走身份比较
+            targets_by_pattern.setdefault(pattern, []).append(
+                (sys.intern(name), rule.get('score', 0.7))
+            )
+
+        self._patterns: List[Tuple[Any, List[Tuple[str, float]]]] = [
+            (_compile_rule_regex(pattern), targets)
+            for pattern, targets in targets_by_pattern.items()
+        ]
+        logger.info("Registered %d distinct custom patterns", len(self._patterns))
+
+        entity_types = list(dict.fromkeys(
+            entity_type for targets in targets_by_pattern.values() for entity_type, _ in targets
+        ))
         super().__init__(
-            supported_entities=[supported_entity or rule['name']],
-            supported_language="en"
+            supported_entities=entity_types,
+            supported_language=supported_language
         )
 
+    def load(self) -> None:
+        """正则已在构造时编译，无需额外加载"""
+        pass
+
     def analyze(
         self, text: str, entities: List[str], nlp_artifacts: NlpArtifacts
     ) -> List[RecognizerResult]:
-        """分析文本"""
+        """逐个模式扫描文本，只为请求的实体类型生成识别结果"""
         results = []
-        
+        wanted = set(entities) if entities else None
+
         try:
-            logger.info(f"Starting analysis with rule: {self.supported_entities[0]}")
-            logger.debug(f"Pattern: {self.pattern}")
-            logger.debug(f"Analyzing text: {text[:100]}...")  # 只记录前100个字符
-            
-            if self.pattern:
-                # 使用正则表达式匹配
-                matches = re.finditer(self.pattern, text)
-                for match in matches:
-                    matched_text = text[match.start():match.end()]
-
-                    result = RecognizerResult(
-                        entity_type=self.supported_entities[0],
-                        start=match.start(),
-                        end=match.end(),
-                        score=self.expected_confidence_level,
-                    )
-                    results.append(result)
-                    
-            logger.info(f"Analysis complete. Found {len(results)} matches for rule {self.supported_entities[0]}")
-            
+            for regex, targets in self._patterns:
+                # 该模式对应的实体都未被请求时跳过扫描
+                if wanted is not None and not any(entity_type in wanted for entity_type, _ in targets):
+                    continue
+                for match in regex.finditer(text):
+                    self._collect(results, match, targets, wanted)
+
+            logger.debug("Custom rule analysis complete. Found %d matches", len(results))
+
         except Exception as e:
             logger.error(f"Error in custom recognizer analysis: {str(e)}", exc_info=True)
-            
+
         return results
 
+    @staticmethod
+    def _collect(
+        results: List[RecognizerResult],
+        match: Any,
+        targets: List[Tuple[str, float]],
+        wanted: Optional[Set[str]]
+    ) -> None:
+        """将一次匹配转换为对应规则的识别结果"""
+        start, end = match.span()
+        for entity_type, score in targets:
+            if wanted is None or entity_type in wanted:
+                results.append(RecognizerResult(
+                    entity_type=entity_type,
+                    start=start,
+                    end=end,
+                    score=score,
+                ))
+
 class PIIDetector:
     """PII检测器类"""
     
     def __init__(self):
         self._initialized = False
         self.analyzer = None
+        self.batch_analyzer = None
         self.anonymizer = None
         self.rules = []
         self.rules_cache = []
+        self.rules_count = 0
+        self.enabled_rules_count = 0
+        # 由规则派生的查找索引，规则变更时在 _refresh_rule_stats 中重建
+        self._custom_entity_names: FrozenSet[str] = frozenset()
+        self._supported_entities: List[str] = list(_ENABLED_PREDEFINED_ENTITIES)
+        self._rules_by_id: Dict[str, Dict[str, Any]] = {}
+        # 规则在内存中被修改后置位，识别器延迟到下一次检测时重建
+        self._rules_dirty = False
+        self._rules_lock = threading.Lock()
         self.last_processing_time = 0.0
         self.initialize()
 
     def initialize(self) -> None:
         """初始化检测器组件"""
+        # 构造时已完成初始化，Services.initialize() 再次调用时不重复构建 NLP 引擎
+        if self._initialized:
+            return
         try:
             # 加载规则
             self.load_rules()
             
             # 初始化分析器
             try:
-                # Use the available spaCy model
+                # 有可用 GPU（cupy）时让 spaCy 在 GPU 上运行，CPU 主机上不会报错
+                if spacy.prefer_gpu():
+                    logger.info("spaCy is using GPU")
+
+                # 只检查模型包是否已安装，不再为探测完整加载一遍模型
                 spacy_model = "en_core_web_sm"
                 for model_name in ["en_core_web_lg", "en_core_web_sm"]:
-                    try:
-                        spacy.load(model_name)
+                    if spacy.util.is_package(model_name):
                         spacy_model = model_name
-                        logger.info(f"Loaded spaCy model: {model_name}")
                         break
-                    except OSError:
-                        continue
+                logger.info("Using spaCy model: %s", spacy_model)
 
                 # Create analyzer with explicit NLP engine config to prevent auto-download
                 nlp_config = {
@@ -190,7 +319,10 @@ class PIIDetector:
                     "models": [{"lang_code": "en", "model_name": spacy_model}],
                 }
                 nlp_engine = NlpEngineProvider(nlp_configuration=nlp_config).create_engine()
+                self._disable_unused_pipes(nlp_engine.nlp["en"])
                 self.analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
+                # 批量分析器与单条分析共享同一个引擎和注册表，只需创建一次
+                self.batch_analyzer = BatchAnalyzerEngine(analyzer_engine=self.analyzer)
 
                 # 初始化匿名化器
                 self.anonymizer = AnonymizerEngine()
@@ -210,11 +342,25 @@ class PIIDetector:
             logger.error(f"Failed to initialize PII detector: {str(e)}")
             raise
 
+    @staticmethod
+    def _disable_unused_pipes(nlp: "spacy.language.Language") -> None:
+        """禁用 Presidio 用不到的 spaCy 组件，减少每个文档的处理开销"""
+        unused = list(_UNUSED_SPACY_PIPES)
+        if not _ENABLED_PREDEFINED_ENTITIES:
+            unused.extend(_LEMMA_SPACY_PIPES)
+        if settings.PII_DISABLE_NER:
+            unused.append("ner")
+        for name in unused:
+            if name in nlp.pipe_names:
+                nlp.disable_pipe(name)
+        logger.info("spaCy pipeline: %s", nlp.pipe_names)
+
     def detect_pii(self, text: str) -> Dict[str, Any]:
         """使用 Presidio 和自定义规则检测文本中的 PII"""
         if not self._initialized:
             logger.warning("PII detector not initialized, initializing now...")
             self.initialize()
+        self._ensure_recognizers()
             
         try:
             logger.info("Starting PII detection")
@@ -230,70 +376,112 @@ class PIIDetector:
                 score_threshold=0.3
             )
             
-            # 匿名化文本
-            anonymized_text = self.anonymizer.anonymize(
-                text=text,
-                analyzer_results=analyzer_results
-            ).text
+            return self._build_detection_result(text, analyzer_results)
             
-            # 转换检测结果为标准格式
-            detected_entities = []
-            for result in analyzer_results:
-                entity = {
-                    "type": result.entity_type,
-                    "text": text[result.start:result.end],
-                    "start": result.start,
-                    "end": result.end,
-                    "score": result.score,
-                    "category": self._get_entity_category(result.entity_type),
-                    "is_custom": self._is_custom_entity(result.entity_type)
-                }
-                detected_entities.append(entity)
+        except Exception as e:
+            logger.error(f"Error in PII detection: {str(e)}")
+            raise
+
+    def detect_pii_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """批量检测 PII，所有文本共享一次 spaCy nlp.pipe 处理"""
+        if not self._initialized:
+            logger.warning("PII detector not initialized, initializing now...")
+            self.initialize()
+        self._ensure_recognizers()
             
-            logger.info(f"Found {len(detected_entities)} PII entities")
+        try:
+            logger.info("Starting batch PII detection for %d texts", len(texts))
             
-            return {
-                "is_safe": len(detected_entities) == 0,
-                "masked_text": anonymized_text,
-                "entities": detected_entities,
-                "analysis": {
-                    "entity_types": list(set(e["type"] for e in detected_entities)),
-                    "risk_level": self._calculate_risk_level(detected_entities),
-                    "custom_entities_found": any(e["is_custom"] for e in detected_entities)
-                }
-            }
+            # 空白文本无需经过 NLP 管道，只把非空文本送入批量分析并记录其原始位置
+            indices = [i for i, text in enumerate(texts) if text.strip()]
+            batch_results = self.batch_analyzer.analyze_iterator(
+                (texts[i] for i in indices),
+                language="en",
+                batch_size=64,
+                entities=self._get_all_supported_entities(),
+                score_threshold=0.3
+            )
+            
+            results = [None] * len(texts)
+            for i, analyzer_results in zip(indices, batch_results):
+                results[i] = self._build_detection_result(texts[i], analyzer_results)
+            for i, result in enumerate(results):
+                if result is None:
+                    results[i] = self._build_detection_result(texts[i], [])
+            return results
             
         except Exception as e:
-            logger.error(f"Error in PII detection: {str(e)}")
+            logger.error(f"Error in batch PII detection: {str(e)}")
             raise
 
+    def _build_detection_result(
+        self, text: str, analyzer_results: List[RecognizerResult]
+    ) -> Dict[str, Any]:
+        """匿名化文本并将分析结果转换为标准格式"""
+        # 匿名化文本
+        anonymized_text = self.anonymizer.anonymize(
+            text=text,
+            analyzer_results=analyzer_results
+        ).text
+        
+        # 转换检测结果为标准格式，同时汇总分析所需的统计信息
+        detected_entities = []
+        entity_types = set()
+        custom_found = False
+        for result in analyzer_results:
+            is_custom = self._is_custom_entity(result.entity_type)
+            entity = {
+                "type": result.entity_type,
+                "text": text[result.start:result.end],
+                "start": result.start,
+                "end": result.end,
+                "score": result.score,
+                "category": self._get_entity_category(result.entity_type),
+                "is_custom": is_custom
+            }
+            detected_entities.append(entity)
+            entity_types.add(result.entity_type)
+            custom_found = custom_found or is_custom
+        
+        logger.info("Found %d PII entities", len(detected_entities))
+        
+        return {
+            "is_safe": len(detected_entities) == 0,
+            "masked_text": anonymized_text,
+            "entities": detected_entities,
+            "analysis": {
+                "entity_types": list(entity_types),
+                "risk_level": self._calculate_risk_level(detected_entities),
+                "custom_entities_found": custom_found
+            }
+        }
+
     def load_rules(self) -> None:
         """从文件加载PII规则"""
         try:
             # 使用 settings 中定义的规则文件路径
             rules_file = settings.PII_RULES_FILE
-            if not rules_file.exists():
-                logger.warning(f"Rules file not found at {rules_file}, using default rules")
-                self.rules = []
-                return
 
             try:
-                with open(rules_file, 'r', encoding='utf-8') as f:
-                    file_rules = json.load(f)
-                    # 支持单个规则或规则列表
-                    if isinstance(file_rules, dict) and "rules" in file_rules:
-                        self.rules = file_rules["rules"]
-                    elif isinstance(file_rules, list):
-                        self.rules = file_rules
-                    else:
-                        logger.warning("Invalid rules format, using empty rules list")
-                        self.rules = []
+                # orjson 直接解析字节，省去文本解码和 json 模块的 Python 层开销
+                file_rules = orjson.loads(rules_file.read_bytes())
+                # 支持单个规则或规则列表
+                if isinstance(file_rules, dict) and "rules" in file_rules:
+                    self.rules = file_rules["rules"]
+                elif isinstance(file_rules, list):
+                    self.rules = file_rules
+                else:
+                    logger.warning("Invalid rules format, using empty rules list")
+                    self.rules = []
                     
                 logger.info(f"Loaded {len(self.rules)} rules from {rules_file}")
                 
                 # 缓存启用的规则
                 self.rules_cache = [rule for rule in self.rules if rule.get('enabled', True)]
                     
+            except FileNotFoundError:
+                logger.warning(f"Rules file not found at {rules_file}, using default rules")
+                self.rules = []
             except Exception as e:
                 logger.error(f"Error loading rules from {rules_file}: {str(e)}")
                 self.rules = []
@@ -301,6 +489,23 @@ class PIIDetector:
         except Exception as e:
             logger.error(f"Error loading PII rules: {str(e)}")
             self.rules = []
+        finally:
+            self._refresh_rule_stats()
+
+    def _refresh_rule_stats(self) -> None:
+        """刷新规则统计和查找索引（仅在规则变更时调用）"""
+        rules = [rule for rule in self.rules if isinstance(rule, dict)]
+        enabled_names = {rule.get('name') for rule in rules if rule.get("enabled", True) and rule.get('name')}
+        self.rules_count = len(self.rules)
+        self.enabled_rules_count = sum(1 for rule in rules if rule.get("enabled", True))
+
+        self._custom_entity_names = frozenset(rule.get('name') for rule in rules)
+        self._supported_entities = list(_ENABLED_PREDEFINED_ENTITIES | enabled_names)
+        # 同一 ID 出现多次时保留第一条，与线性查找的结果一致
+        rules_by_id = {}
+        for rule in rules:
+            rules_by_id.setdefault(rule.get("id"), rule)
+        self._rules_by_id = rules_by_id
 
     def update_rules(self, rules: List[Dict[str, Any]]) -> bool:
         """更新所有规则并重新初始化检测器"""
@@ -342,9 +547,13 @@ class PIIDetector:
             
             # 3. 更新规则
             self.rules = valid_rules
+            self.rules_cache = [rule for rule in valid_rules if rule.get('enabled', True)]
             
-            # 4. 重新初始化检测器
-            self.initialize()
+            # 4. 仅重建自定义识别器；重新 initialize 会从文件重新加载规则（覆盖本次更新）并重建 NLP 引擎
+            if self._initialized:
+                self._register_custom_rules()
+            else:
+                self.initialize()
             
             return True
             
@@ -353,59 +562,34 @@ class PIIDetector:
             # 回滚到原始状态
             self.rules = original_rules
             self.analyzer = original_analyzer
+            self._refresh_rule_stats()
             return False
 
     def _get_all_supported_entities(self) -> List[str]:
-        """获取所有支持的实体类型（预定义 + 自定义）"""
-        # 预定义的实体类型
-        predefined_entities = {
-            "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", 
-            "CREDIT_CARD", "IBAN_CODE", "LOCATION", 
-            "PASSPORT", "DRIVER_LICENSE", "TAX_ID",
-            "BANK_ACCOUNT", "ID_CARD", "MAC_ADDRESS",
-            "IP_ADDRESS", "NRP", "MEDICAL_LICENSE"
-        }
-        
-        # 从自定义规则中获取实体类型
-        custom_entities = {rule.get('name') for rule in self.rules if rule.get('enabled', True)}
-        
-        # 合并并返回所有实体类型
-        return list(predefined_entities | custom_entities)
+        """获取所有支持的实体类型（已启用的预定义 + 自定义）"""
+        return self._supported_entities
 
     def _is_custom_entity(self, entity_type: str) -> bool:
         """检查是否为自定义实体类型"""
-        return any(rule.get('name') == entity_type for rule in self.rules)
+        return entity_type in self._custom_entity_names
 
     def _get_entity_category(self, entity_type: str) -> str:
         """获取实体类别"""
-        categories = {
-            "PERSON": "personal",
-            "EMAIL_ADDRESS": "contact",
-            "PHONE_NUMBER": "contact",
-            "CREDIT_CARD": "financial",
-            "IBAN_CODE": "financial",
-            "BANK_ACCOUNT": "financial",
-            "LOCATION": "location",
-            "PASSPORT": "id",
-            "DRIVER_LICENSE": "id",
-            "ID_CARD": "id",
-            "TAX_ID": "financial",
-            "MAC_ADDRESS": "technical",
-            "IP_ADDRESS": "technical",
-            "NRP": "medical",
-            "MEDICAL_LICENSE": "medical"
-        }
-        return categories.get(entity_type, "other")
+        return _ENTITY_CATEGORIES.get(entity_type, "other")
 
     def _calculate_risk_level(self, entities: List[Dict[str, Any]]) -> str:
         """计算风险等级"""
         if not entities:
             return "low"
             
-        # 计算平均置信度得分
-        avg_score = sum(e["score"] for e in entities) / len(entities)
-        # 考虑实体数量和类型
-        unique_categories = len(set(e["category"] for e in entities))
+        # 单次遍历计算平均置信度得分和类别数
+        total_score = 0.0
+        categories = set()
+        for e in entities:
+            total_score += e["score"]
+            categories.add(e["category"])
+        avg_score = total_score / len(entities)
+        unique_categories = len(categories)
         
         if avg_score > 0.8 and unique_categories > 2:
             return "high"
@@ -416,52 +600,56 @@ class PIIDetector:
 
     def _get_category(self, entity_type: str) -> str:
         """根据实体类型返回分类"""
-        for rule in self.rules:
-            if rule["id"] == entity_type:
-                return rule.get("category", "general")
-        return "general"
+        rule = self._rules_by_id.get(entity_type)
+        return rule.get("category", "general") if rule else "general"
 
     def _get_country(self, entity_type: str) -> str:
         """根据实体类型返回相关国家"""
-        for rule in self.rules:
-            if rule["id"] == entity_type:
-                return rule.get("country", "international")
-        return "international"
+        rule = self._rules_by_id.get(entity_type)
+        return rule.get("country", "international") if rule else "international"
 
     def get_processing_time(self) -> float:
         """获取最近一次处理的时间（秒）"""
         return self.last_processing_time
 
+    def mark_rules_changed(self) -> None:
+        """规则在内存中被增删改后调用：立即刷新统计和索引，识别器延迟到下一次检测时重建"""
+        self._refresh_rule_stats()
+        self._rules_dirty = True
+
+    def _ensure_recognizers(self) -> None:
+        """规则有变更时重建识别器，连续多次修改只在下一次检测前重建一次"""
+        if not self._rules_dirty:
+            return
+        with self._rules_lock:
+            if self._rules_dirty:
+                self._register_custom_rules()
+
     def _register_custom_rules(self) -> None:
         """注册自定义规则"""
+        # 先清除标志，重建期间发生的修改会再次置位，不会丢失
+        self._rules_dirty = False
         try:
             registry = RecognizerRegistry()
             
-            # 遍历所有规则
-            for rule in self.rules:
-                if not rule.get('enabled', True):
-                    continue
-                    
-                try:
-                    # 创建自定义规则识别器
-                    recognizer = CustomRuleRecognizer(
-                        rule=rule,
-                        supported_entity=rule.get('name')
-                    )
-                    
-                    # 添加到注册表
-                    registry.add_recognizer(recognizer)
-                    logger.info(f"Added custom recognizer for rule: {rule['name']}")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to create recognizer for rule {rule.get('name', 'unknown')}: {str(e)}")
-                    continue
+            # 仅在启用了预定义实体时加载内置识别器，电话识别器只校验配置的地区
+            if _ENABLED_PREDEFINED_ENTITIES:
+                registry.load_predefined_recognizers(languages=["en"])
+                registry.remove_recognizer("PhoneRecognizer")
+                registry.add_recognizer(PhoneRecognizer(supported_regions=_PHONE_REGIONS))
+            
+            # 所有启用的规则注册为一个识别器，模式相同的规则只扫描一次
+            enabled_rules = [rule for rule in self.rules if rule.get('enabled', True)]
+            if enabled_rules:
+                registry.add_recognizer(CustomRegexRecognizer(rules=enabled_rules))
             
             # 更新分析器的注册表
             self.analyzer.registry = registry
-            logger.info(f"Successfully registered {len(self.rules)} custom recognizers")
+            self._refresh_rule_stats()
+            logger.info("Successfully registered %d custom rules", len(enabled_rules))
             
         except Exception as e:
+            self._rules_dirty = True
             logger.error(f"Error registering custom rules: {str(e)}")
             raise
 
@@ -473,6 +661,7 @@ class PIIDetector:
             # 清理分析器
             if self.analyzer:
                 self.analyzer = None
+                self.batch_analyzer = None
                 
             # 清理匿名器
             if self.anonymizer:
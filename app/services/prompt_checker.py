@@ -1,6 +1,3 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 import time
@@ -71,12 +68,9 @@ class PromptChecker:
             if not self._initialized:
                 self.initialize()
             
-            # 获取模型输出
-            model_output = await self.model_manager.get_model_output(text)
-            
             # 获取风险分数
-            jailbreak_score = await self.model_manager.get_jailbreak_score(self.model_manager.current_model, text)
-            indirect_injection_score = await self.model_manager.get_indirect_injection_score(self.model_manager.current_model, text)
+            jailbreak_score = await self.model_manager.get_jailbreak_score(self.model_manager.current_model.id, text)
+            indirect_injection_score = await self.model_manager.get_indirect_injection_score(self.model_manager.current_model.id, text)
             
             # 解释模型输出
             risk_level = self._interpret_model_output(jailbreak_score, indirect_injection_score)
@@ -91,7 +85,7 @@ class PromptChecker:
                 "jailbreak_score": jailbreak_score,
                 "indirect_injection_score": indirect_injection_score,
                 "analysis_time": datetime.now().isoformat(),
-                "model": self.model_manager.current_model
+                "model": self.model_manager.get_current_model()
             }
             
             logger.info(f"Analysis result for text '{text[:50]}...': {result}")
@@ -146,7 +140,7 @@ class PromptChecker:
                     "jailbreak_score": 1.0,
                     "indirect_injection_score": 1.0,
                     "analysis_time": datetime.now().isoformat(),
-                    "model": self.model_manager.current_model,
+                    "model": self.model_manager.get_current_model(),
                     "error": str(e)
                 })
         return results
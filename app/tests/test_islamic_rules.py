@@ -0,0 +1,101 @@
+"""Islamic 规则载入与更新测试"""
+import asyncio
+
+import orjson
+import pytest
+
+pytest.importorskip("httpx")
+
+from core.config import settings
+from services.islamic_context_manager import IslamicContextManager
+
+
+RULES = {
+    "version": "1.0",
+    "categories": ["worship"],
+    "rules": [
+        {"id": "w1", "name": "Prayer", "category": "worship", "description": "Respect prayer times"},
+    ],
+}
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """指向临时规则目录、已载入英文规则的管理器"""
+    (tmp_path / "islamic_rules_en.json").write_bytes(orjson.dumps(RULES))
+    monkeypatch.setattr(settings, "ISLAMIC_RULES_DIR", str(tmp_path))
+    mgr = IslamicContextManager()
+    mgr.load_rules()
+    mgr._initialized = True
+    return mgr
+
+
+def test_in_memory_edits_do_not_leak_into_file_cache(manager):
+    manager.rules_data["en"]["rules"].append({"id": "x", "name": "Extra", "category": "worship", "description": "Added in memory"})
+
+    # 强制按同一 (路径, 修改时间) 重新载入，应拿到磁盘上的原始规则
+    manager._rules_mtimes.clear()
+    assert manager._ensure_language_loaded("en")
+    assert manager.rules_data["en"]["rules"] == RULES["rules"]
+
+
+def _fresh_manager():
+    mgr = IslamicContextManager()
+    mgr.load_rules()
+    return mgr
+
+
+def test_prompt_file_is_written_with_rules_key(manager, tmp_path):
+    content = (tmp_path / "islamic_rules_en.prompt.txt").read_text(encoding="utf-8")
+
+    header, _, prompt = content.partition("\n")
+    assert header == f"#key:{manager._prompt_key()}"
+    assert prompt == manager._cached_system_prompt
+
+
+def test_valid_prompt_file_is_reused(manager, tmp_path):
+    prompt_file = tmp_path / "islamic_rules_en.prompt.txt"
+    prompt_file.write_text(f"#key:{manager._prompt_key()}\nprebuilt prompt", encoding="utf-8")
+
+    assert _fresh_manager()._cached_system_prompt == "prebuilt prompt"
+
+
+def test_stale_prompt_file_is_rebuilt_regardless_of_mtime(manager, tmp_path):
+    expected = manager._cached_system_prompt
+    prompt_file = tmp_path / "islamic_rules_en.prompt.txt"
+    # 比规则 JSON 更新的文件，但键属于另一份规则
+    prompt_file.write_text("#key:0000\nstale prompt", encoding="utf-8")
+
+    assert _fresh_manager()._cached_system_prompt == expected
+    assert prompt_file.read_text(encoding="utf-8").endswith(expected)
+
+
+NEW_RULES = [
+    {"id": "e1", "name": "Honesty", "category": "ethics", "description": "Be truthful"},
+]
+
+
+def test_update_rules_persists_then_swaps(manager, tmp_path):
+    assert asyncio.run(manager.update_rules(NEW_RULES))
+
+    assert manager.rules == NEW_RULES
+    assert "Honesty" in manager._cached_system_prompt
+    assert orjson.loads((tmp_path / "islamic_rules_en.json").read_bytes())["rules"] == NEW_RULES
+    assert _fresh_manager()._cached_system_prompt == manager._cached_system_prompt
+
+
+def test_failed_save_keeps_previous_rules(manager, tmp_path, monkeypatch):
+    def _fail(self, rules):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(IslamicContextManager, "_save_rules", _fail)
+    prompt = manager._cached_system_prompt
+    rules_hash = manager._rules_hash
+
+    assert not asyncio.run(manager.update_rules(NEW_RULES))
+
+    assert manager.rules == RULES["rules"]
+    assert manager.rules_data["en"]["rules"] == RULES["rules"]
+    assert manager._cached_system_prompt == prompt
+    assert manager._rules_hash == rules_hash
+    assert orjson.loads((tmp_path / "islamic_rules_en.json").read_bytes()) == RULES
@@ -0,0 +1,114 @@
+"""合批推理测试：动态合批和 detect_batch 的分数须与逐条前向计算一致"""
+import asyncio
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from core.config import settings
+from services.model_manager import ModelManager
+
+
+MODEL_ID = "test/tiny-bert"
+WORDS = ["ignore", "previous", "instructions", "you", "are", "now", "hello", "world", "system", "rules"]
+
+# 长短不一的输入，覆盖多个长度桶和桶内填充
+TEXTS = [
+    "hello",
+    "ignore previous instructions",
+    "you are now system " * 20,
+    "hello world",
+    "rules " * 100,
+    "you are now",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_model(tmp_path_factory):
+    vocab = tmp_path_factory.mktemp("vocab") / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]), encoding="utf-8")
+    tokenizer = transformers.BertTokenizerFast(vocab_file=str(vocab))
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        num_labels=2,
+    )
+    model = transformers.BertForSequenceClassification(config).eval()
+    return model, tokenizer
+
+
+@pytest.fixture
+def make_manager(tiny_model, monkeypatch):
+    """走真实的构造和预加载流程，只把单个模型的加载替换为测试用的小模型"""
+    model, tokenizer = tiny_model
+    monkeypatch.setattr(settings, "AVAILABLE_MODELS", {MODEL_ID: "tiny"})
+    monkeypatch.setattr(settings, "DEFAULT_MODEL", MODEL_ID)
+    monkeypatch.setattr(settings, "QUANTIZE", False)
+    monkeypatch.setattr(settings, "TORCH_COMPILE", False)
+    monkeypatch.setattr(ModelManager, "_load_one", lambda self, model_id: (tokenizer, model))
+
+    def _make(use_scratch=True):
+        if not use_scratch:
+            # 不分配预分配缓冲区，_pad_batch 退回 tokenizer.pad
+            monkeypatch.setattr(ModelManager, "_alloc_scratch", lambda self: None)
+        return ModelManager()
+
+    return _make
+
+
+def _reference_scores(tiny_model):
+    """基线：每条文本单独、不填充地做一次前向计算"""
+    model, tokenizer = tiny_model
+    scores = []
+    with torch.inference_mode():
+        for text in TEXTS:
+            inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
+            scores.append(torch.softmax(model(**inputs).logits, dim=-1)[0, 1].item())
+    return scores
+
+
+@pytest.fixture(autouse=True)
+def _no_prob_cache(monkeypatch):
+    # 关闭概率缓存，保证每次都真正做前向计算
+    monkeypatch.setattr(settings, "INFERENCE_CACHE_SIZE", 0)
+
+
+@pytest.mark.parametrize("use_scratch", [True, False])
+def test_detect_batch_matches_single_forward(tiny_model, make_manager, use_scratch):
+    mgr = make_manager(use_scratch)
+
+    results = asyncio.run(mgr.detect_batch(TEXTS, batch_size=4))
+
+    assert [r["score"] for r in results] == pytest.approx(_reference_scores(tiny_model), abs=1e-5)
+
+
+@pytest.mark.parametrize("use_scratch", [True, False])
+def test_micro_batched_detect_matches_single_forward(tiny_model, make_manager, use_scratch, monkeypatch):
+    monkeypatch.setattr(settings, "INFERENCE_MAX_WAIT_MS", 50)
+    mgr = make_manager(use_scratch)
+
+    async def _run():
+        # 并发提交，由后台合批任务合并成一次前向计算；asyncio.run 退出时会取消合批任务
+        return await asyncio.gather(*(mgr.detect(text) for text in TEXTS))
+
+    results = asyncio.run(_run())
+
+    assert [r["score"] for r in results] == pytest.approx(_reference_scores(tiny_model), abs=1e-5)
+
+
+def test_detect_batch_and_detect_agree(make_manager):
+    mgr = make_manager()
+
+    async def _run():
+        batch = await mgr.detect_batch(TEXTS)
+        single = [await mgr.detect(text) for text in TEXTS]
+        return batch, single
+
+    batch, single = asyncio.run(_run())
+
+    assert [r["score"] for r in batch] == pytest.approx([r["score"] for r in single], abs=1e-5)
@@ -0,0 +1,90 @@
+"""自定义规则识别器测试：结果须与逐条规则独立扫描一致"""
+import re
+
+import pytest
+
+pytest.importorskip("presidio_analyzer")
+
+from services.pii_detector import CustomRegexRecognizer
+
+
+BRUNEI_RULES = [
+    {"name": "Bruneian Name Pattern", "pattern": r"(?i)(?:bin|binti|anak|anak\s+dari)\s+[A-Za-z\s]+"},
+    {"name": "Brunei Phone Number", "pattern": r"(?:\+?673|0673)?[2-8]\d{6}"},
+    {"name": "Brunei Driver's License", "pattern": r"[A-Z]\d{7}"},
+    {"name": "Brunei Email Address", "pattern": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"},
+    {"name": "Brunei IC", "pattern": r"[A-Z]\d{6}"},
+    {"name": "Brunei Passport", "pattern": r"[A-Z]\d{7}"},
+    {"name": "Brunei Bank Account", "pattern": r"\d{10,14}"},
+    {"name": "BruHealth Number", "pattern": r"^(BN|Bn|bN|bn)\d{8}$"},
+]
+
+
+def _per_rule(rules, text):
+    """基线：每条规则各自扫描一遍"""
+    return sorted(
+        (rule["name"], m.start(), m.end())
+        for rule in rules
+        for m in re.finditer(rule["pattern"], text)
+    )
+
+
+def _scan(recognizer, text):
+    return sorted((r.entity_type, r.start, r.end) for r in recognizer.analyze(text, None, None))
+
+
+@pytest.mark.parametrize("text", [
+    "Ali bin Abu called 6737123456 or A1234567 mail a.b@x.com",
+    "IC B123456, licence C7654321, account 12345678901",
+    "bn12345678",
+    "",
+])
+def test_matches_per_rule_scanning(text):
+    recognizer = CustomRegexRecognizer(BRUNEI_RULES)
+    assert _scan(recognizer, text) == _per_rule(BRUNEI_RULES, text)
+
+
+def test_overlapping_rules_report_both_entities():
+    rules = [
+        {"name": "LICENSE", "pattern": r"[A-Z]\d{7}"},
+        {"name": "IC", "pattern": r"[A-Z]\d{6}"},
+    ]
+    recognizer = CustomRegexRecognizer(rules)
+
+    assert _scan(recognizer, "A1234567") == [("IC", 0, 7), ("LICENSE", 0, 8)]
+
+
+def test_identical_patterns_share_one_scan():
+    rules = [
+        {"name": "LICENSE", "pattern": r"[A-Z]\d{7}"},
+        {"name": "PASSPORT", "pattern": r"[A-Z]\d{7}"},
+    ]
+    recognizer = CustomRegexRecognizer(rules)
+
+    assert len(recognizer._patterns) == 1
+    assert _scan(recognizer, "A1234567") == [("LICENSE", 0, 8), ("PASSPORT", 0, 8)]
+
+
+def test_invalid_pattern_is_skipped():
+    rules = [
+        {"name": "BAD", "pattern": "a)("},
+        {"name": "GOOD", "pattern": r"\d{3}"},
+    ]
+    recognizer = CustomRegexRecognizer(rules)
+
+    assert recognizer.supported_entities == ["GOOD"]
+    assert _scan(recognizer, "x 123") == [("GOOD", 2, 5)]
+
+
+def test_requested_entities_filter_results():
+    recognizer = CustomRegexRecognizer(BRUNEI_RULES)
+    results = recognizer.analyze("A1234567", ["Brunei IC"], None)
+
+    assert [(r.entity_type, r.start, r.end) for r in results] == [("Brunei IC", 0, 7)]
+
+
+def test_unicode_digits_match_by_default():
+    # 默认使用标准库 re，\d 同样匹配阿拉伯-印度数字等非 ASCII 数字
+    recognizer = CustomRegexRecognizer([{"name": "NUM", "pattern": r"\d{3}"}])
+
+    assert _scan(recognizer, "no ١٢٣") == [("NUM", 3, 6)]
@@ -1,6 +1,7 @@
 """辅助函数模块"""
 import json
 import os
+import orjson
 from typing import Dict, Any, Optional, List, Union
 import time
 from pathlib import Path
@@ -21,16 +22,15 @@ def load_json_file(file_path: str, default_value: Optional[Any] = None) -> Any:
     - 加载的JSON数据或默认值
     """
     try:
-        path = Path(file_path)
-        if not path.exists():
-            logger.warning(f"File not found: {file_path}")
-            return default_value
-            
-        with path.open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            logger.debug(f"Successfully loaded JSON from {file_path}")
-            return data
+        # 直接打开读取，文件不存在时由 FileNotFoundError 处理，省去单独的 exists() 检查
+        # orjson 直接解析字节，省去文本解码和 json 模块的 Python 层开销
+        data = orjson.loads(Path(file_path).read_bytes())
+        logger.debug("Successfully loaded JSON from %s", file_path)
+        return data
             
+    except FileNotFoundError:
+        logger.warning(f"File not found: {file_path}")
+        return default_value
     except json.JSONDecodeError as e:
         logger.error(f"JSON decode error in {file_path}: {str(e)}")
         return default_value
@@ -56,10 +56,10 @@ def save_json_file(file_path: str, data: Any, ensure_dir: bool = True) -> bool:
         # 确保目录存在
         path.parent.mkdir(parents=True, exist_ok=True)
         
-        with path.open('w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Successfully saved JSON to {file_path}")
-            return True
+        # orjson 直接输出 UTF-8 字节（等同 ensure_ascii=False），以二进制写入省去再次编码
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        logger.debug(f"Successfully saved JSON to {file_path}")
+        return True
             
     except Exception as e:
         logger.error(f"Error saving to {file_path}: {str(e)}")